@@ -116,6 +116,14 @@ class ConfigLoader:
         """Check if tables should stretch to full terminal width."""
         return self.get('display.stretch_to_terminal', True)
 
+    def should_use_plain_output_when_piped(self) -> bool:
+        """Check if tables should be written as plain tab-separated rows when stdout is not a terminal."""
+        return self.get('display.plain_output_when_piped', True)
+
+    def should_page_long_tables(self) -> bool:
+        """Check if tables taller than the terminal should be shown one screen at a time."""
+        return self.get('display.page_long_tables', False)
+
     def get_currency_config(self) -> Dict[str, Any]:
         """Get currency formatting configuration."""
         return self.get('currency', {
@@ -140,7 +148,10 @@ class ConfigLoader:
             'yahoo': {
                 'timeout': 30,
                 'retries': 3,
-                'cache_duration': 300
+                'cache_duration': 300,
+                'closed_cache_duration': 600,
+                'stale_duration': 0,
+                'max_workers': 16
             }
         })
 
@@ -3,6 +3,8 @@ Modern Portfolio Library for the Stock Portfolio Tracker.
 Integrates YAML portfolios, Yahoo Finance API, Rich display, and currency formatting.
 """
 
+import sys
+import time
 import pandas as pd
 from typing import Dict, List, Any, Optional, Tuple
 from .config_loader import get_config_loader
@@ -11,6 +13,21 @@ from .yahoo_quotes import get_yahoo_quotes
 from .rich_display import get_rich_display
 from .currency_formatter import get_currency_formatter
 
+# Sort column names accepted on the command line, mapped to DataFrame columns
+SORT_COLUMN_MAP = {
+    'portfolio': 'Portfolio',
+    'symbol': 'Symbol',
+    'description': 'Description',
+    'qty': 'Qty',
+    'ave': 'Ave$',  # Will be 'Day$' in day mode
+    'price': 'Price',
+    'gain_pct': 'Gain%',
+    'cost': 'Cost',
+    'gain_dollars': 'Gain$',
+    'value': 'Value'
+}
+VALID_SORT_COLUMNS = frozenset(SORT_COLUMN_MAP)
+
 
 class PortfolioLibrary:
     """Modern portfolio management with YAML, Yahoo Finance, and Rich display."""
@@ -37,6 +54,10 @@ class PortfolioLibrary:
         self.df: Optional[pd.DataFrame] = None
         self.stats: Dict[str, Any] = {}
         self._show_cache_message = False
+        self._refreshing_cache = False
+        self._stale_cache_age = 0.0
+        # Memoized _portfolio_contains_crypto results, reset on reload
+        self._crypto_portfolios: Dict[str, bool] = {}
 
         # Headers for display
         self.headers = ['Portfolio', 'Symbol', 'Description',
@@ -48,33 +69,24 @@ class PortfolioLibrary:
         self.sort_columns = []  # For multi-column sorting
 
         # Column mapping for sorting
-        self.sort_column_map = {
-            'portfolio': 'Portfolio',
-            'symbol': 'Symbol',
-            'description': 'Description',
-            'qty': 'Qty',
-            'ave': 'Ave$',  # Will be 'Day$' in day mode
-            'price': 'Price',
-            'gain_pct': 'Gain%',
-            'cost': 'Cost',
-            'gain_dollars': 'Gain$',
-            'value': 'Value'
-        }
+        self.sort_column_map = SORT_COLUMN_MAP
 
     def load_portfolios(self, live_data=False):
         """Load all portfolios and prepare data."""
         self.portfolios = self.portfolio_loader.load_portfolios()
+        self._crypto_portfolios.clear()
         self.all_stocks = self.portfolio_loader.get_all_stocks()
 
         # Filter stocks based on settings
         filtered_stocks = self._filter_stocks()
 
         # Get quotes for all symbols, but exclude those with manual prices
-        # Extract actual symbols from the composite keys
-        all_symbols = [stock_data['symbol']
-                       for stock_data in filtered_stocks.values()]
-        manual_price_symbols = self._get_symbols_with_manual_prices(
-            filtered_stocks)
+        # Extract actual symbols from the composite keys, de-duplicated so a
+        # symbol held in several portfolios is only quoted once
+        all_symbols = list(dict.fromkeys(
+            stock_data['symbol'] for stock_data in filtered_stocks.values()))
+        manual_price_symbols = set(self._get_symbols_with_manual_prices(
+            filtered_stocks))
         symbols_to_fetch = [
             s for s in all_symbols if s not in manual_price_symbols]
 
@@ -93,9 +105,18 @@ class PortfolioLibrary:
             self.yahoo_quotes = YahooQuotes(load_from_file=True)
 
         # Check if we have valid cached data for symbols that need fetching
+        self._refreshing_cache = False
         if not live_data and self._has_valid_cache(symbols_to_fetch):
             self.quotes = self._get_cached_quotes(symbols_to_fetch)
             self._show_cache_message = True
+        elif not live_data and self._has_valid_cache(symbols_to_fetch, allow_stale=True):
+            # Stale-while-revalidate: show the expired cache now and refresh
+            # it in the background for the next run
+            self.quotes = self._get_cached_quotes(symbols_to_fetch)
+            self._show_cache_message = True
+            self._refreshing_cache = True
+            self._stale_cache_age = self._oldest_cache_age(symbols_to_fetch)
+            self.yahoo_quotes.refresh_in_background(symbols_to_fetch)
         else:
             # Only fetch live data for symbols that don't have manual prices
             if symbols_to_fetch:
@@ -115,17 +136,22 @@ class PortfolioLibrary:
         # Calculate statistics
         self._calculate_statistics()
 
-    def _has_valid_cache(self, symbols: List[str]) -> bool:
-        """Check if we have valid cached data for all symbols."""
+    def _has_valid_cache(self, symbols: List[str], allow_stale: bool = False) -> bool:
+        """Check if we have valid (or, with allow_stale, usable) cached data for all symbols."""
         if not symbols:
             return False
 
         for symbol in symbols:
-            if symbol not in self.yahoo_quotes.cache or not self.yahoo_quotes._is_cache_valid(symbol):
+            if symbol not in self.yahoo_quotes.cache or not self.yahoo_quotes._is_cache_valid(symbol, allow_stale):
                 return False
 
         return True
 
+    def _oldest_cache_age(self, symbols: List[str]) -> float:
+        """Get the age in seconds of the oldest cached quote for symbols."""
+        timestamps = self.yahoo_quotes.cache_timestamps
+        return time.time() - min(timestamps[symbol] for symbol in symbols)
+
     def _get_cached_quotes(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
         """Get cached quotes for symbols."""
         quotes = {}
@@ -213,6 +239,7 @@ class PortfolioLibrary:
     def _process_data(self, stocks: Dict[str, Dict[str, Any]]):
         """Process stock data into pandas DataFrame."""
         rows = []
+        max_length = self.config_loader.get_max_description_length()
 
         for portfolio_symbol, stock_data in stocks.items():
             # Extract the actual symbol from the portfolio_symbol key
@@ -238,14 +265,11 @@ class PortfolioLibrary:
             portfolio = stock_data['portfolio']
             # Use Yahoo description instead of portfolio description, truncate if too long
             description = quote.get('description', symbol)
-            max_length = self.config_loader.get_max_description_length()
             if len(description) > max_length:
                 description = description[:max_length-3] + "..."
 
             # Calculate totals across all lots
-            total_shares = sum(lot['shares'] for lot in stock_data['lots'])
-            total_cost = sum(lot['shares'] * lot['cost_basis']
-                             for lot in stock_data['lots'])
+            total_shares, total_cost = self._sum_lots(stock_data['lots'])
             average_cost = total_cost / total_shares if total_shares > 0 else 0
 
             # Get current price
@@ -308,6 +332,25 @@ class PortfolioLibrary:
         self.headers = ['Portfolio', 'Symbol', 'Description', 'Qty',
                         'Day$' if self.day_mode else 'Ave$', 'Price', 'Gain%', 'Cost', 'Gain$', 'Value']
 
+    @staticmethod
+    def _sum_lots(lots: List[Dict[str, Any]]) -> Tuple[float, float]:
+        """
+        Total the shares and cost of a position's lots in a single pass.
+
+        Args:
+            lots: Lots with 'shares' and 'cost_basis' values
+
+        Returns:
+            Tuple of (total shares, total cost)
+        """
+        total_shares = 0.0
+        total_cost = 0.0
+        for lot in lots:
+            shares = lot['shares']
+            total_shares += shares
+            total_cost += shares * lot['cost_basis']
+        return total_shares, total_cost
+
     def _calculate_statistics(self):
         """Calculate portfolio statistics."""
         if self.df is None or self.df.empty:
@@ -382,6 +425,11 @@ class PortfolioLibrary:
         # Convert to display format
         display_data = self._format_display_data(sorted_portfolio_data)
 
+        # Piped or redirected output skips table rendering entirely
+        if self._use_plain_output():
+            self.rich_display.display_plain_table(self.headers, display_data)
+            return
+
         # Prepare footer data if totals are enabled
         footer_data = None
         if self.show_totals:
@@ -446,6 +494,11 @@ class PortfolioLibrary:
         # Convert to display format
         display_data = self._format_display_data(sorted_data)
 
+        # Piped or redirected output skips table rendering entirely
+        if self._use_plain_output():
+            self.rich_display.display_plain_table(self.headers, display_data)
+            return
+
         # Prepare footer data if totals are enabled
         footer_data = None
         if self.show_totals:
@@ -485,6 +538,16 @@ class PortfolioLibrary:
         # Group data by portfolio
         grouped_data = self.df.groupby('Portfolio')
 
+        # Piped or redirected output skips table rendering entirely, keeping
+        # the Portfolio column so rows can still be told apart by group
+        if self._use_plain_output():
+            display_data = []
+            for _, portfolio_df in grouped_data:
+                display_data.extend(self._format_display_data(
+                    self._apply_sorting(portfolio_df)))
+            self.rich_display.display_plain_table(self.headers, display_data)
+            return
+
         # Headers without Portfolio column for grouped display
         grouped_headers = ['Symbol', 'Description', 'Qty',
                            'Ave$', 'Price', 'Gain%', 'Cost', 'Gain$', 'Value']
@@ -580,6 +643,11 @@ class PortfolioLibrary:
         # Show cache message if applicable
         self._show_cache_status_message()
 
+    def _use_plain_output(self) -> bool:
+        """Check if tables should be written as plain rows (stdout is not a terminal)."""
+        return (self.config_loader.should_use_plain_output_when_piped()
+                and not sys.stdout.isatty())
+
     def _format_display_data_grouped(self, df):
         """Format data for grouped display (without Portfolio column)."""
         display_data = []
@@ -847,6 +915,7 @@ class PortfolioLibrary:
     def load_portfolio_names_only(self):
         """Load only portfolio names without fetching quotes."""
         self.portfolios = self.portfolio_loader.load_portfolios()
+        self._crypto_portfolios.clear()
         self.all_stocks = self.portfolio_loader.get_all_stocks()
 
     def get_portfolio_names(self) -> List[str]:
@@ -925,19 +994,16 @@ class PortfolioLibrary:
 
     def _portfolio_contains_crypto(self, portfolio_name: str) -> bool:
         """Check if a portfolio contains crypto symbols."""
-        if portfolio_name not in self.portfolios:
-            return False
+        if portfolio_name in self._crypto_portfolios:
+            return self._crypto_portfolios[portfolio_name]
 
-        portfolio = self.portfolios[portfolio_name]
-        if 'stocks' not in portfolio:
-            return False
+        portfolio = self.portfolios.get(portfolio_name, {})
 
         # Check if any symbol in the portfolio is crypto
-        for symbol in portfolio['stocks'].keys():
-            if self.yahoo_quotes.is_crypto(symbol):
-                return True
-
-        return False
+        contains_crypto = any(self.yahoo_quotes.is_crypto(symbol)
+                              for symbol in portfolio.get('stocks', {}))
+        self._crypto_portfolios[portfolio_name] = contains_crypto
+        return contains_crypto
 
     def _generate_portfolio_title(self, portfolio_name: str, portfolio_data: pd.DataFrame) -> str:
         """Generate portfolio title with average gain percentage and color coding."""
@@ -973,7 +1039,10 @@ class PortfolioLibrary:
 
     def _show_cache_status_message(self):
         """Show cache status message at the bottom of display."""
-        if self._show_cache_message:
+        if self._refreshing_cache:
+            print(f"\nUsing expired cached data up to {int(self._stale_cache_age // 60)} minutes old "
+                  "while refreshing in the background. Use --live to force fresh data fetch.")
+        elif self._show_cache_message:
             print("\nUsing cached data. Use --live to force fresh data fetch.")
         else:
             print("\nLive data fetched successfully.")
@@ -3,21 +3,43 @@ YAML portfolio loader for the Stock Portfolio Tracker.
 Handles loading and parsing of YAML portfolio files.
 """
 
+import copy
 import os
 import yaml
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional, Tuple, Union
 from pathlib import Path
 from .config_loader import get_config_loader
 
+# Upper bound on threads used to read and parse portfolio files
+MAX_LOAD_WORKERS = 16
+
+# libyaml-backed safe loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Optional file holding several portfolios as "---" separated documents
+BUNDLE_FILE_NAME = 'portfolios.bundle.yaml'
+
 
 class PortfolioLoader:
     """Handles loading and parsing of YAML portfolio files."""
 
-    def __init__(self):
-        """Initialize the portfolio loader."""
+    # Parsed portfolio files shared by all loaders:
+    # absolute path -> ((mtime_ns, size), validated portfolios in the file)
+    _cache: Dict[str, Tuple[Tuple[int, int], List[Dict[str, Any]]]] = {}
+
+    def __init__(self, loader_fn: Optional[Callable[[], Dict[str, Any]]] = None):
+        """
+        Initialize the portfolio loader.
+
+        Args:
+            loader_fn: Optional function returning parsed portfolio documents
+                keyed by name, used instead of reading the portfolios directory
+        """
         self.config_loader = get_config_loader()
         self.portfolios_dir = Path(self.config_loader.get_portfolio_path())
         self.portfolios: Dict[str, Dict[str, Any]] = {}
+        self.loader_fn = loader_fn
 
     def load_portfolios(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -26,24 +48,102 @@ class PortfolioLoader:
         Returns:
             Dictionary mapping portfolio names to portfolio data
         """
+        if self.loader_fn is not None:
+            return self._load_from_function()
+
         if not self.portfolios_dir.exists():
             raise FileNotFoundError(
                 f"Portfolios directory not found: {self.portfolios_dir}")
 
         self.portfolios.clear()
 
-        for yaml_file in self.portfolios_dir.glob("*.yaml"):
-            try:
-                portfolio_data = self._load_portfolio_file(yaml_file)
-                if portfolio_data:
-                    portfolio_name = portfolio_data.get('name', yaml_file.stem)
-                    self.portfolios[portfolio_name] = portfolio_data
-            except Exception as e:
-                print(f"WARNING: Failed to load portfolio {yaml_file}: {e}")
-                continue
+        # Stat every portfolio file in a single directory pass
+        signatures: Dict[Path, Tuple[int, int]] = {}
+        with os.scandir(self.portfolios_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.yaml') and entry.is_file():
+                    stat = entry.stat()
+                    signatures[Path(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+
+        # Reuse files that are unchanged since they were last parsed
+        results: Dict[Path, List[Dict[str, Any]]] = {}
+        stale_files = []
+        for yaml_file, signature in signatures.items():
+            cached = self._cache.get(str(yaml_file))
+            if cached is not None and cached[0] == signature:
+                results[yaml_file] = copy.deepcopy(cached[1])
+            else:
+                stale_files.append(yaml_file)
+
+        if stale_files:
+            # Read and parse changed files concurrently
+            max_workers = min(MAX_LOAD_WORKERS, len(stale_files))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                parsed = executor.map(self._load_file, stale_files)
+                for yaml_file, file_portfolios in zip(stale_files, parsed):
+                    results[yaml_file] = file_portfolios
+                    if file_portfolios:
+                        self._cache[str(yaml_file)] = (
+                            signatures[yaml_file], copy.deepcopy(file_portfolios))
+                    else:
+                        # Keep reporting invalid files until they are fixed
+                        self._cache.pop(str(yaml_file), None)
+
+        self._forget_missing_files(signatures)
+
+        # _load_file reports its own errors and skips invalid portfolios
+        for yaml_file in signatures:
+            for portfolio_data in results[yaml_file]:
+                portfolio_name = portfolio_data.get('name', yaml_file.stem)
+                self.portfolios[portfolio_name] = portfolio_data
 
         return self.portfolios
 
+    def _load_from_function(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load portfolios from the documents returned by loader_fn.
+
+        Returns:
+            Dictionary mapping portfolio names to portfolio data
+        """
+        self.portfolios.clear()
+        for name, document in self.loader_fn().items():
+            # Validation normalizes in place, so leave the caller's data alone
+            portfolio_data = self._validate_document(
+                copy.deepcopy(document), name, name)
+            if portfolio_data:
+                self.portfolios[portfolio_data['name']] = portfolio_data
+        return self.portfolios
+
+    def _forget_missing_files(self, signatures: Dict[Path, Tuple[int, int]]) -> None:
+        """
+        Drop cached entries for files removed from the portfolios directory.
+
+        Args:
+            signatures: Portfolio files currently present in the directory
+        """
+        directory = str(self.portfolios_dir)
+        present = {str(yaml_file) for yaml_file in signatures}
+        for cached_file in list(self._cache):
+            if os.path.dirname(cached_file) == directory and cached_file not in present:
+                del self._cache[cached_file]
+
+    def _load_file(self, file_path: Path) -> List[Dict[str, Any]]:
+        """
+        Load the portfolios stored in a YAML file.
+
+        Args:
+            file_path: Path to the YAML file
+
+        Returns:
+            List of valid portfolios in the file (empty if none)
+        """
+        if file_path.name == BUNDLE_FILE_NAME:
+            return self._load_bundle_file(file_path)
+
+        portfolio_data = self._load_portfolio_file(file_path)
+        return [portfolio_data] if portfolio_data else []
+
     def _load_portfolio_file(self, file_path: Path) -> Optional[Dict[str, Any]]:
         """
         Load a single portfolio file.
@@ -56,33 +156,101 @@ class PortfolioLoader:
         """
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                portfolio_data = yaml.safe_load(f)
+                portfolio_data = yaml.load(f, Loader=_YAML_LOADER)
 
-            if not isinstance(portfolio_data, dict):
-                print(f"WARNING: Invalid portfolio file format: {file_path}")
-                return None
+            return self._validate_portfolio(portfolio_data, file_path, file_path.stem)
 
-            # Validate required fields
-            if 'name' not in portfolio_data:
-                portfolio_data['name'] = file_path.stem
+        except yaml.YAMLError as e:
+            print(f"ERROR: Invalid YAML in {file_path}: {e}")
+            return None
+        except Exception as e:
+            print(f"ERROR: Failed to load {file_path}: {e}")
+            return None
 
-            if 'stocks' not in portfolio_data:
-                print(f"WARNING: No stocks found in portfolio: {file_path}")
-                return None
+    def _load_bundle_file(self, file_path: Path) -> List[Dict[str, Any]]:
+        """
+        Load a bundle file holding one portfolio per YAML document.
+
+        Documents are streamed through a single loader, and a document
+        without a name is named after the file and its position.
 
-            # Validate and normalize stock data
-            portfolio_data['stocks'] = self._validate_stocks(
-                portfolio_data['stocks'])
+        Args:
+            file_path: Path to the bundle file
 
-            return portfolio_data
+        Returns:
+            List of valid portfolios in the bundle (empty if failed)
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                documents = list(yaml.load_all(f, Loader=_YAML_LOADER))
+
+            # A bad document is skipped without losing the rest of the bundle
+            portfolios = []
+            for index, document in enumerate(documents, 1):
+                portfolio_data = self._validate_document(
+                    document, f"{file_path} (document {index})",
+                    f"{file_path.stem}-{index}")
+                if portfolio_data:
+                    portfolios.append(portfolio_data)
+            return portfolios
 
         except yaml.YAMLError as e:
             print(f"ERROR: Invalid YAML in {file_path}: {e}")
-            return None
+            return []
         except Exception as e:
             print(f"ERROR: Failed to load {file_path}: {e}")
+            return []
+
+    def _validate_document(self, document: Any, source: str,
+                           default_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Validate one portfolio document, reporting and skipping it if it fails.
+
+        Args:
+            document: Parsed portfolio document
+            source: Where the document came from, for messages
+            default_name: Name used when the document has none
+
+        Returns:
+            Portfolio data dictionary or None if invalid
+        """
+        try:
+            return self._validate_portfolio(document, source, default_name)
+        except Exception as e:
+            print(f"ERROR: Invalid portfolio in {source}: {e}")
             return None
 
+    def _validate_portfolio(self, portfolio_data: Any, file_path: Union[Path, str],
+                            default_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Validate and normalize a parsed portfolio document.
+
+        Args:
+            portfolio_data: Parsed YAML document
+            file_path: File (or other source) the document came from, for warnings
+            default_name: Name used when the document has none
+
+        Returns:
+            Portfolio data dictionary or None if invalid
+        """
+        if not isinstance(portfolio_data, dict):
+            print(f"WARNING: Invalid portfolio file format: {file_path}")
+            return None
+
+        # Validate required fields
+        if 'name' not in portfolio_data:
+            portfolio_data['name'] = default_name
+
+        if 'stocks' not in portfolio_data:
+            print(f"WARNING: No stocks found in portfolio: {file_path}")
+            return None
+
+        # Validate and normalize stock data
+        portfolio_data['stocks'] = self._validate_stocks(
+            portfolio_data['stocks'])
+
+        return portfolio_data
+
     def _validate_stocks(self, stocks: Dict[str, Any]) -> Dict[str, Any]:
         """
         Validate and normalize stock data.
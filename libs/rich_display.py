@@ -3,8 +3,12 @@ Rich table display utilities for the Stock Portfolio Tracker.
 Provides modern table display with borders and columnar options.
 """
 
-from typing import List, Dict, Any, Optional, Union
+import csv
+import sys
+from functools import lru_cache, partial
+from typing import Callable, List, Dict, Any, Optional, Union, TextIO
 from rich.console import Console
+from rich.style import Style
 from rich.table import Table
 from rich.text import Text
 from rich.align import Align
@@ -13,16 +17,46 @@ from columnar import columnar
 from .config_loader import get_config_loader
 from .currency_formatter import get_currency_formatter
 
+# Numeric columns formatted as currency
+CURRENCY_COLUMNS = ('Cost', 'Gain$', 'Value', 'Ave$', 'Day$', 'Price')
+# Numeric columns colored green when positive (all columns are red when negative)
+GAIN_LOSS_COLUMNS = ('Gain$', 'Gain%', 'Value')
+
+# Styles for text cells by upper-cased column name (other columns are white)
+TEXT_CELL_STYLES = {
+    'SYMBOL': "bright_cyan bold",
+    'TICKER': "bright_cyan bold",
+    'PORTFOLIO': "bright_magenta",
+    'NAME': "bright_magenta",
+    'DESCRIPTION': "bright_blue",
+    'DESC': "bright_blue",
+}
+
+# Formatted numeric cells remembered per column, as portfolios repeat values
+CELL_CACHE_SIZE = 4096
+
+_GAIN_STYLE = Style(color="green")
+_LOSS_STYLE = Style(color="red")
+
 
 class RichDisplay:
     """Handles Rich-based table display with configuration support."""
 
-    def __init__(self):
-        """Initialize the Rich display with configuration."""
+    def __init__(self, console: Optional[Console] = None):
+        """
+        Initialize the Rich display with configuration.
+
+        Args:
+            console: Console to print to (defaults to a new stdout console)
+        """
         self.config_loader = get_config_loader()
         self.table_config = self.config_loader.get_table_config()
         self.currency_formatter = get_currency_formatter()
-        self.console = Console()
+        self.console = console if console is not None else Console()
+        # Numeric cell formatters by column name, built on first use and
+        # rebuilt when the currency config they were built from changes
+        self._col_formatters: Dict[str, Callable[[Union[int, float]], Text]] = {}
+        self._col_formatters_config: Dict[str, Any] = {}
 
     def create_table(
         self,
@@ -45,6 +79,8 @@ class RichDisplay:
         Returns:
             Rich Table object
         """
+        self._sync_cell_formatters()
+
         # Create table with footer support
         show_footer = footer_data is not None
         # Only expand table if we should stretch to terminal width
@@ -106,40 +142,36 @@ class RichDisplay:
 
             table.add_column(header_text, justify=justify, footer=footer_text)
 
-        # Add rows
-        for row in data:
+        # Bind everything used for each cell to locals once per table
+        add_row = table.add_row
+        format_numeric = self._format_cell_with_rich_color
+        format_value = self._format_value_with_rich_gain_color
+        # Cells beyond the last header are formatted as untitled columns
+        column_headers = list(headers) + [""] * max(
+            (len(row) for row in data), default=0)
+        text_styles = {header: TEXT_CELL_STYLES.get(header.upper(), "white")
+                       for header in column_headers}
+
+        def format_row(row):
             # Convert row data to Rich Text objects for proper coloring
-            formatted_row = []
-            for i, cell in enumerate(row):
-                header = headers[i] if i < len(headers) else ""
-
+            has_gain_column = len(row) > 7
+            for cell, header in zip(row, column_headers):
                 if isinstance(cell, (int, float)):
                     # Special handling for VALUE column - color based on Gain$
-                    # Ensure we have Gain$ column
-                    if header == 'Value' and len(row) > 7:
-                        gain_dollars = row[7]  # Gain$ is typically at index 7
-                        formatted_cell = self._format_value_with_rich_gain_color(
-                            cell, gain_dollars)
+                    # (Gain$ is typically at index 7)
+                    if header == 'Value' and has_gain_column:
+                        yield format_value(cell, row[7])
                     else:
                         # Use Rich colors for numeric cells
-                        formatted_cell = self._format_cell_with_rich_color(
-                            cell, header)
+                        yield format_numeric(cell, header)
                 else:
                     # Color text cells based on column type
-                    cell_str = str(cell) if cell is not None else ""
-                    if header.upper() in ['SYMBOL', 'TICKER']:
-                        formatted_cell = Text(
-                            cell_str, style="bright_cyan bold")
-                    elif header.upper() in ['PORTFOLIO', 'NAME']:
-                        formatted_cell = Text(cell_str, style="bright_magenta")
-                    elif header.upper() in ['DESCRIPTION', 'DESC']:
-                        formatted_cell = Text(cell_str, style="bright_blue")
-                    else:
-                        formatted_cell = Text(cell_str, style="white")
+                    yield Text(str(cell) if cell is not None else "",
+                               style=text_styles[header])
 
-                formatted_row.append(formatted_cell)
-
-            table.add_row(*formatted_row)
+        # Add rows
+        for row in data:
+            add_row(*format_row(row))
 
         return table
 
@@ -213,6 +245,9 @@ class RichDisplay:
         """
         Format a cell with Rich colors based on value and column type.
 
+        Repeated values reuse the same Text object, so callers must not
+        modify the result.
+
         Args:
             value: The numeric value to format
             column_type: Type of column (e.g., 'Gain$', 'Gain%', 'Value')
@@ -220,48 +255,70 @@ class RichDisplay:
         Returns:
             Rich Text object with appropriate colors
         """
+        formatter = self._col_formatters.get(column_type)
+        if formatter is None:
+            formatter = self._build_cell_formatter(column_type)
+            self._col_formatters[column_type] = formatter
+        if not value:
+            # -0.0 would otherwise share a cache entry with 0.0
+            value = abs(value)
+        return formatter(value)
+
+    def _sync_cell_formatters(self):
+        """Drop the cached cell formatters if the currency config was reloaded."""
+        currency_config = self.config_loader.get_currency_config()
+        if currency_config != self._col_formatters_config:
+            self._col_formatters.clear()
+            self._col_formatters_config = dict(currency_config)
+
+    def _build_cell_formatter(self, column_type: str) -> Callable[[Union[int, float]], Text]:
+        """
+        Build the Rich formatter for numeric cells of a column.
+
+        Args:
+            column_type: Type of column (e.g., 'Gain$', 'Gain%', 'Value')
+
+        Returns:
+            Function turning a numeric value into a colored Rich Text object,
+            caching the result for each value
+        """
         # For Rich display, use colored_mode from config
         # If colored_mode is true, use colors and drop negative sign
         # If colored_mode is false, use parentheses for negative values
         currency_config = self.config_loader.get_currency_config()
         use_colors = currency_config['colored_mode']
-        is_gain_loss_column = column_type in ['Gain$', 'Gain%', 'Value']
         drop_negative_sign = use_colors  # Drop negative sign when using colors
 
-        # Format the value using currency formatter
-        if 'Gain%' in column_type or '%' in column_type:
-            formatted_text = self.currency_formatter.format_percentage(
-                value,
-                rich_mode=True,
-                colored_mode=False,  # Rich handles its own coloring
-                drop_negative_sign=drop_negative_sign
-            )
-        elif column_type in ['Cost', 'Gain$', 'Value', 'Ave$', 'Day$', 'Price']:
-            formatted_text = self.currency_formatter.format_currency(
-                value,
-                rich_mode=True,
-                colored_mode=False,  # Rich handles its own coloring
-                drop_negative_sign=drop_negative_sign
-            )
+        # Rich handles its own coloring, so the formatter never colors
+        if '%' in column_type:
+            format_value = partial(
+                self.currency_formatter.format_percentage, rich_mode=True,
+                colored_mode=False, drop_negative_sign=drop_negative_sign)
+        elif column_type in CURRENCY_COLUMNS:
+            format_value = partial(
+                self.currency_formatter.format_currency, rich_mode=True,
+                colored_mode=False, drop_negative_sign=drop_negative_sign)
         else:
-            formatted_text = self.currency_formatter.format_number(
-                value, rich_mode=True)
+            format_value = partial(
+                self.currency_formatter.format_number, rich_mode=True)
 
-        # Create Rich Text with colors
-        # Apply colors based on value and column type
-        if use_colors:
-            # Use Rich colors when colored_mode is enabled
-            if value < 0:
-                text = Text(formatted_text, style="red")
-            elif value > 0 and is_gain_loss_column:
-                text = Text(formatted_text, style="green")
-            else:
-                text = Text(formatted_text)
-        else:
+        if not use_colors:
             # No colors when colored_mode is disabled
-            text = Text(formatted_text)
+            return lru_cache(maxsize=CELL_CACHE_SIZE, typed=True)(
+                lambda value: Text(format_value(value)))
 
-        return text
+        gain_style = _GAIN_STYLE if column_type in GAIN_LOSS_COLUMNS else ""
+
+        # Typed, so values of different numeric types never share an entry
+        @lru_cache(maxsize=CELL_CACHE_SIZE, typed=True)
+        def format_cell(value: Union[int, float]) -> Text:
+            if value < 0:
+                return Text(format_value(value), style=_LOSS_STYLE)
+            if value > 0:
+                return Text(format_value(value), style=gain_style)
+            return Text(format_value(value))
+
+        return format_cell
 
     def display_columnar_table(
         self,
@@ -339,6 +396,45 @@ class RichDisplay:
         cleaned_lines = [line.rstrip() for line in lines]
         print('\n'.join(cleaned_lines))
 
+    def display_plain_table(
+        self,
+        headers: List[str],
+        data: List[List[Any]],
+        file: Optional[TextIO] = None
+    ):
+        """
+        Write a table as plain tab-separated rows without any styling.
+
+        Used when output is piped or redirected, where borders and color
+        codes would only get in the way.
+
+        Args:
+            headers: List of column headers
+            data: List of rows
+            file: Output stream (defaults to sys.stdout)
+        """
+        writer = csv.writer(file or sys.stdout,
+                            dialect='excel-tab', lineterminator='\n')
+        writer.writerow(headers)
+        for row in data:
+            writer.writerow([self._format_plain_cell(cell) for cell in row])
+
+    def _format_plain_cell(self, value: Any) -> str:
+        """
+        Format a cell for plain output.
+
+        Args:
+            value: Cell value
+
+        Returns:
+            Unstyled string, with floats rounded to two decimals
+        """
+        if value is None:
+            return ''
+        if isinstance(value, float):
+            return f"{value:.2f}"
+        return str(value)
+
     def _format_value_with_gain_color(self, value: Union[int, float], gain_dollars: Union[int, float]) -> str:
         """
         Format VALUE column with color based on Gain$ value.
@@ -458,22 +554,116 @@ class RichDisplay:
             width: Terminal width override
             footer_data: Optional list of footer values for each column
         """
-        table = self.create_table(headers, data, bordered, title, footer_data)
-
         # Determine console width based on stretch setting
         if width:
             # Use provided width (explicit override)
-            console = Console(width=width)
-            console.print(table)
+            console = self._console_with_width(width)
         elif self.config_loader.should_stretch_to_terminal():
             # Stretch to full terminal width - ignore terminal_width setting
-            self.console.print(table)
+            console = self.console
         else:
             # Use configured terminal width (don't stretch)
             configured_width = self.config_loader.get_terminal_width()
-            console = Console(width=configured_width)
+            console = self._console_with_width(configured_width)
+
+        page_rows = self._get_page_rows(console, bordered, footer_data)
+        if page_rows and len(data) > page_rows:
+            self._display_paged_table(
+                console, headers, data, bordered, title, footer_data, page_rows)
+            return
+
+        table = self.create_table(headers, data, bordered, title, footer_data)
+        console.print(table)
+
+    def _console_with_width(self, width: int) -> Console:
+        """
+        Create a console like the injected one but with a fixed width.
+
+        Args:
+            width: Console width in characters
+
+        Returns:
+            Console sharing the injected console's output and color settings
+        """
+        return Console(
+            width=width,
+            file=self.console.file,
+            no_color=self.console.no_color,
+            force_terminal=self.console.is_terminal,
+            color_system=self.console.color_system,
+            legacy_windows=self.console.legacy_windows,
+        )
+
+    def _get_page_rows(
+        self,
+        console: Console,
+        bordered: bool,
+        footer_data: Optional[List[str]]
+    ) -> int:
+        """
+        Get how many rows fit on one screen when paging long tables.
+
+        Args:
+            console: Console the table is printed to
+            bordered: Whether the table has borders
+            footer_data: Optional list of footer values for each column
+
+        Returns:
+            Rows per page, or 0 when tables should not be paged
+        """
+        if not (self.config_loader.should_page_long_tables()
+                and console.is_terminal and sys.stdin.isatty()):
+            return 0
+
+        # Title, header, header rule and the "more" prompt
+        overhead = 4
+        if bordered:
+            overhead += 2  # Top and bottom borders
+        if footer_data is not None:
+            overhead += 2  # Footer rule and footer
+        return max(console.size.height - overhead, 1)
+
+    def _display_paged_table(
+        self,
+        console: Console,
+        headers: List[str],
+        data: List[List[Any]],
+        bordered: bool,
+        title: Optional[str],
+        footer_data: Optional[List[str]],
+        page_rows: int
+    ):
+        """
+        Display a long table one screen at a time.
+
+        Only the rows of the page being shown are formatted, and the footer
+        is shown with the last page.
+
+        Args:
+            console: Console the table is printed to
+            headers: List of column headers
+            data: List of rows
+            bordered: Whether to show borders
+            title: Optional table title
+            footer_data: Optional list of footer values for each column
+            page_rows: Number of rows per page
+        """
+        pages = (len(data) + page_rows - 1) // page_rows
+        for page in range(pages):
+            page_data = data[page * page_rows:(page + 1) * page_rows]
+            last_page = page == pages - 1
+            page_title = f"{title or ''} ({page + 1}/{pages})".lstrip()
+            table = self.create_table(
+                headers, page_data, bordered, page_title,
+                footer_data if last_page else None)
             console.print(table)
 
+            if not last_page:
+                answer = console.input(
+                    "[dim]-- More: Enter for next page, q to quit --[/dim] ")
+                if answer.strip().lower() == 'q':
+                    break
+
     def display_portfolio_table(
         self,
         portfolio_name: str,
@@ -7,20 +7,75 @@ import yfinance as yf
 import time
 import json
 import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 from .config_loader import get_config_loader
 
+try:
+    # Faster JSON decoding for the quote cache file
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Browser-impersonating session that yfinance itself uses when available
+    from curl_cffi import requests as _http
+    _SESSION_KWARGS = {'impersonate': 'chrome'}
+except ImportError:
+    import requests as _http
+    _SESSION_KWARGS = {}
+
 # Global cache storage
 _global_cache: Dict[str, Dict[str, Any]] = {}
 _global_cache_timestamps: Dict[str, float] = {}
 _yahoo_quotes_instance = None
 
+# Characters Yahoo uses in symbols (e.g. BRK-B, BTC-USD, 0700.HK, ^GSPC, EURUSD=X)
+_SYMBOL_RE = re.compile(r'[A-Za-z0-9.\-^=]{1,20}')
+
+# Serializes cache file writes between the main and refresh threads
+_cache_file_lock = threading.Lock()
+
+# HTTP session shared by all tickers so connections are kept alive
+_http_session = None
+_http_session_lock = threading.Lock()
+
 # Cache file path - use hidden .cache directory
 CACHE_FILE = os.path.join(os.path.dirname(
     __file__), '..', '.cache', 'quotes_cache.json')
 CACHE_DIR = os.path.dirname(CACHE_FILE)
 
 
+def _decode_cache(raw: bytes) -> Dict[str, Any]:
+    """
+    Decode the quote cache file, using orjson when it is installed.
+
+    Args:
+        raw: Contents of the cache file
+
+    Returns:
+        Decoded cache data
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # json writes NaN for missing prices, which orjson rejects
+            pass
+    return json.loads(raw)
+
+
+def _get_http_session():
+    """Get the HTTP session shared by all quote requests."""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            _http_session = _http.Session(**_SESSION_KWARGS)
+    return _http_session
+
+
 class YahooQuotes:
     """Handles Yahoo Finance API integration for stock and crypto quotes."""
 
@@ -31,6 +86,10 @@ class YahooQuotes:
         # Use module-level cache to persist across instances
         self.cache = _global_cache
         self.cache_timestamps = _global_cache_timestamps
+        # Reuse one session so every fetch skips the TLS handshake
+        self._session = _get_http_session()
+        # Suppress fetch warnings (used for background refreshes)
+        self.quiet = False
         # Load cache from file only if requested
         if load_from_file:
             self._load_cache_from_file()
@@ -40,8 +99,8 @@ class YahooQuotes:
         """Load cache from file."""
         try:
             if os.path.exists(CACHE_FILE):
-                with open(CACHE_FILE, 'r') as f:
-                    cache_data = json.load(f)
+                with open(CACHE_FILE, 'rb') as f:
+                    cache_data = _decode_cache(f.read())
                     # Clear existing cache first
                     self.cache.clear()
                     self.cache_timestamps.clear()
@@ -60,32 +119,63 @@ class YahooQuotes:
                 print(f"DEBUG: Failed to load cache from file: {e}")
 
     def _save_cache_to_file(self):
-        """Save cache to file."""
+        """
+        Save cache to file.
+
+        The file is written to a temporary name and then renamed over the
+        cache, so a refresh thread abandoned at exit never leaves it truncated.
+        """
         try:
             # Ensure cache directory exists
             os.makedirs(CACHE_DIR, exist_ok=True)
 
-            cache_data = {
-                'quotes': self.cache,
-                'timestamps': self.cache_timestamps
-            }
+            with _cache_file_lock:
+                # Snapshot, as the other thread may be adding quotes
+                cache_data = {
+                    'quotes': dict(self.cache),
+                    'timestamps': dict(self.cache_timestamps)
+                }
 
-            with open(CACHE_FILE, 'w') as f:
-                json.dump(cache_data, f, indent=2, sort_keys=True)
-                if self.config_loader.should_show_cache_status():
-                    print(
-                        f"DEBUG: Saved cache to file - {len(self.cache)} entries")
+                temp_file = CACHE_FILE + '.tmp'
+                with open(temp_file, 'w') as f:
+                    json.dump(cache_data, f, indent=2, sort_keys=True)
+                os.replace(temp_file, CACHE_FILE)
+
+            if self.config_loader.should_show_cache_status():
+                print(
+                    f"DEBUG: Saved cache to file - {len(cache_data['quotes'])} entries")
         except Exception as e:
             if self.config_loader.should_show_cache_status():
                 print(f"DEBUG: Failed to save cache to file: {e}")
 
-    def _is_cache_valid(self, symbol: str) -> bool:
-        """Check if cached data for a symbol is still valid."""
+    def _warn(self, message: str):
+        """Print a fetch warning unless running quietly."""
+        if not self.quiet:
+            print(message)
+
+    def _is_cache_valid(self, symbol: str, allow_stale: bool = False) -> bool:
+        """
+        Check if cached data for a symbol is still valid.
+
+        Args:
+            symbol: Stock or crypto symbol
+            allow_stale: Also accept entries within the stale_duration grace
+                period that follows cache_duration
+
+        Returns:
+            True if the cached entry can be used
+        """
         if symbol not in self.cache_timestamps:
             return False
 
-        cache_duration = self.api_config['cache_duration']
-        return time.time() - self.cache_timestamps[symbol] < cache_duration
+        max_age = self.api_config['cache_duration']
+        # Prices do not move outside regular trading hours
+        quote = self.cache.get(symbol)
+        if quote and quote.get('market_state', 'REGULAR') != 'REGULAR':
+            max_age = max(max_age, self.api_config.get('closed_cache_duration', max_age))
+        if allow_stale:
+            max_age += self.api_config.get('stale_duration', 0)
+        return time.time() - self.cache_timestamps[symbol] < max_age
 
     def _get_ticker_data(self, symbol: str) -> Optional[yf.Ticker]:
         """
@@ -98,17 +188,39 @@ class YahooQuotes:
             yfinance Ticker object or None if failed
         """
         try:
-            return yf.Ticker(symbol)
+            return yf.Ticker(symbol, session=self._session)
         except Exception as e:
-            print(f"WARNING: Failed to create ticker for {symbol}: {e}")
+            self._warn(f"WARNING: Failed to create ticker for {symbol}: {e}")
             return None
 
-    def _get_quote_data(self, symbol: str) -> Optional[Dict[str, Any]]:
+    def _get_tickers_data(self, symbols: List[str]) -> Dict[str, yf.Ticker]:
+        """
+        Get ticker objects for several symbols through one yf.Tickers batch.
+
+        Args:
+            symbols: Stock or crypto symbols
+
+        Returns:
+            Dictionary mapping each symbol to its Ticker, empty if failed
+        """
+        try:
+            tickers = yf.Tickers(" ".join(symbols), session=self._session).tickers
+        except Exception as e:
+            self._warn(f"WARNING: Failed to create tickers for {', '.join(symbols)}: {e}")
+            return {}
+        # yf.Tickers keys its tickers by upper-cased symbol
+        return {symbol: tickers[symbol.upper()]
+                for symbol in symbols if symbol.upper() in tickers}
+
+    def _get_quote_data(self, symbol: str, save_cache: bool = True,
+                        ticker: Optional[yf.Ticker] = None) -> Optional[Dict[str, Any]]:
         """
         Get quote data for a symbol with caching and retries.
 
         Args:
             symbol: Stock or crypto symbol
+            save_cache: Persist the cache to file after a successful fetch
+            ticker: Ticker already created for the symbol by a batch request
 
         Returns:
             Dictionary containing quote data or None if failed
@@ -117,7 +229,8 @@ class YahooQuotes:
         if symbol in self.cache and self._is_cache_valid(symbol):
             return self.cache[symbol]
 
-        ticker = self._get_ticker_data(symbol)
+        if ticker is None:
+            ticker = self._get_ticker_data(symbol)
         if not ticker:
             return None
 
@@ -131,7 +244,7 @@ class YahooQuotes:
                 history = ticker.history(period="2d")
 
                 if history.empty:
-                    print(f"WARNING: No price data available for {symbol}")
+                    self._warn(f"WARNING: No price data available for {symbol}")
                     return None
 
                 # Extract relevant data
@@ -150,6 +263,7 @@ class YahooQuotes:
                     'description': info.get('longName', symbol),
                     'currency': info.get('currency', 'USD'),
                     'exchange': info.get('exchange', 'Unknown'),
+                    'market_state': info.get('marketState', 'REGULAR'),
                     'market_cap': info.get('marketCap'),
                     'pe_ratio': info.get('trailingPE'),
                     'dividend_yield': info.get('dividendYield'),
@@ -163,17 +277,18 @@ class YahooQuotes:
                 self.cache_timestamps[symbol] = time.time()
 
                 # Save cache to file
-                self._save_cache_to_file()
+                if save_cache:
+                    self._save_cache_to_file()
 
                 return quote_data
 
             except Exception as e:
                 if attempt < retries:
-                    print(
+                    self._warn(
                         f"WARNING: Attempt {attempt + 1} failed for {symbol}: {e}")
                     time.sleep(1)  # Wait before retry
                 else:
-                    print(
+                    self._warn(
                         f"ERROR: Failed to get quote for {symbol} after {retries + 1} attempts: {e}")
                     return None
 
@@ -190,16 +305,78 @@ class YahooQuotes:
             Dictionary mapping symbols to quote data
         """
         quotes = {}
+        if not symbols:
+            return quotes
 
-        for symbol in symbols:
-            quote_data = self._get_quote_data(symbol)
+        symbols = self._unique_valid_symbols(symbols)
+        if not symbols:
+            return quotes
+
+        stale_symbols = [s for s in symbols if not self._is_cache_valid(s)]
+        needs_fetch = bool(stale_symbols)
+
+        # Create the tickers for every uncached symbol in one batch
+        tickers = self._get_tickers_data(stale_symbols) if needs_fetch else {}
+
+        # Fetches are network-bound, so run them concurrently. The cache file
+        # is written once afterwards instead of from every worker thread.
+        max_workers = min(self.api_config.get('max_workers', 16), len(symbols))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(
+                lambda symbol: self._get_quote_data(
+                    symbol, save_cache=False, ticker=tickers.get(symbol)),
+                symbols))
+
+        for symbol, quote_data in zip(symbols, results):
             if quote_data:
                 quotes[symbol] = quote_data
             else:
-                print(f"WARNING: Could not get quote for {symbol}")
+                self._warn(f"WARNING: Could not get quote for {symbol}")
+
+        if needs_fetch and quotes:
+            self._save_cache_to_file()
 
         return quotes
 
+    def refresh_in_background(self, symbols: List[str]) -> threading.Thread:
+        """
+        Refresh quotes on a worker thread while cached data is being shown.
+
+        The worker shares the module-level cache and saves it to file after
+        every quote, so the next invocation starts with whatever was fetched.
+        The thread is a daemon: the process exits as soon as the caller is
+        done, abandoning any quotes still in flight.
+
+        Args:
+            symbols: List of stock/crypto symbols to refresh
+
+        Returns:
+            The started thread
+        """
+        refresher = YahooQuotes(load_from_file=False)
+        refresher.quiet = True
+        thread = threading.Thread(
+            target=refresher._refresh_quotes, args=(list(symbols),),
+            name='quote-refresh', daemon=True)
+        thread.start()
+        return thread
+
+    def _refresh_quotes(self, symbols: List[str]):
+        """
+        Fetch quotes one at a time, saving the cache after each.
+
+        Runs on the daemon refresh thread. It does not use a thread pool,
+        because the interpreter joins pool workers at exit, which would keep
+        the process waiting on the network.
+
+        Args:
+            symbols: List of stock/crypto symbols to refresh
+        """
+        symbols = self._unique_valid_symbols(symbols)
+        tickers = self._get_tickers_data(symbols)
+        for symbol in symbols:
+            self._get_quote_data(symbol, ticker=tickers.get(symbol))
+
     def get_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
         """
         Get quote for a single symbol.
@@ -210,8 +387,45 @@ class YahooQuotes:
         Returns:
             Quote data dictionary or None if failed
         """
+        if not self._is_valid_symbol(symbol):
+            return None
         return self._get_quote_data(symbol)
 
+    def _is_valid_symbol(self, symbol: Any) -> bool:
+        """
+        Check that a symbol is well formed before any request is made.
+
+        Args:
+            symbol: Value passed in as a symbol
+
+        Returns:
+            True if the symbol can be quoted, False (with a warning) otherwise
+        """
+        if not symbol or not isinstance(symbol, str) or not _SYMBOL_RE.fullmatch(symbol):
+            self._warn(f"WARNING: Invalid symbol: {symbol!r}")
+            return False
+        return True
+
+    def _unique_valid_symbols(self, symbols: List[str]) -> List[str]:
+        """
+        De-duplicate symbols, keeping the caller's order and dropping invalid ones.
+
+        Args:
+            symbols: List of stock/crypto symbols
+
+        Returns:
+            List of unique, well-formed symbols
+        """
+        unique = []
+        seen = set()
+        for symbol in symbols:
+            if isinstance(symbol, str) and symbol in seen:
+                continue
+            if self._is_valid_symbol(symbol):
+                seen.add(symbol)
+                unique.append(symbol)
+        return unique
+
     def is_crypto(self, symbol: str) -> bool:
         """
         Check if a symbol is a cryptocurrency.
@@ -243,7 +457,7 @@ class YahooQuotes:
             List of mover data
         """
         try:
-            ticker = yf.Ticker(index)
+            ticker = yf.Ticker(index, session=self._session)
             # This is a simplified implementation
             # In practice, you might want to use a different approach
             # as yfinance doesn't have a direct movers API
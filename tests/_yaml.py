@@ -0,0 +1,10 @@
+"""
+YAML dumper/loader selection for tests.
+Uses the libyaml C implementation when PyYAML was built with it.
+"""
+try:
+    from yaml import CSafeDumper as Dumper, CSafeLoader as Loader
+except ImportError:
+    from yaml import SafeDumper as Dumper, SafeLoader as Loader
+
+__all__ = ['Dumper', 'Loader']
@@ -1,31 +1,122 @@
 """
 Pytest configuration and fixtures for TradeTrack tests.
 """
+import copy
 import os
 import sys
-import tempfile
-import shutil
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 import pytest
-import pandas as pd
 
-# Add the project root to the Python path
+# The project root is put on sys.path by pytest (pythonpath in pyproject.toml)
 project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
 
 from libs.config_loader import ConfigLoader
-from libs.portfolio_library import PortfolioLibrary
 from libs.currency_formatter import CurrencyFormatter
 from libs.rich_display import RichDisplay
 
+# Directories never searched for Python source files
+IGNORED_SOURCE_DIRS = frozenset({
+    'venv', '.venv', '__pycache__', '.git', 'node_modules',
+    '.pytest_cache', '.mypy_cache', '.tox', '.cache'
+})
+
+# Rows shared by the sample portfolio fixtures
+SAMPLE_PORTFOLIO_ROWS = [
+    {'Portfolio': 'TEST', 'Symbol': 'AAPL', 'Description': 'Apple Inc.',
+     'Qty': 10, 'Ave$': 150.0, 'Price': 175.0, 'Gain%': 16.67,
+     'Cost': 1500.0, 'Gain$': 250.0, 'Value': 1750.0},
+    {'Portfolio': 'TEST', 'Symbol': 'GOOGL', 'Description': 'Alphabet Inc.',
+     'Qty': 5, 'Ave$': 2800.0, 'Price': 2900.0, 'Gain%': 3.57,
+     'Cost': 14000.0, 'Gain$': 500.0, 'Value': 14500.0},
+    {'Portfolio': 'TEST', 'Symbol': 'MSFT', 'Description': 'Microsoft Corp.',
+     'Qty': 8, 'Ave$': 300.0, 'Price': 320.0, 'Gain%': 6.67,
+     'Cost': 2400.0, 'Gain$': 160.0, 'Value': 2560.0}
+]
+
 
 @pytest.fixture
-def temp_dir():
-    """Create a temporary directory for test files."""
-    temp_dir = tempfile.mkdtemp()
-    yield temp_dir
-    shutil.rmtree(temp_dir)
+def temp_dir(tmp_path):
+    """Temporary directory for test files, as a string path."""
+    return str(tmp_path)
+
+
+@pytest.fixture(scope="session")
+def modules():
+    """Application modules, imported once per session (and per xdist worker)."""
+    import libs.yahoo_quotes as yq
+    import libs.portfolio_loader as pl
+    import libs.rich_display as rd
+    return SimpleNamespace(yq=yq, pl=pl, rd=rd)
+
+
+@pytest.fixture(autouse=True)
+def isolated_quote_cache(tmp_path, monkeypatch):
+    """Point the quote cache file at a per-test directory (safe under xdist)."""
+    from libs import yahoo_quotes
+    cache_dir = tmp_path / '.cache'
+    monkeypatch.setattr(yahoo_quotes, 'CACHE_DIR', str(cache_dir))
+    monkeypatch.setattr(yahoo_quotes, 'CACHE_FILE', str(cache_dir / 'quotes_cache.json'))
+
+
+def _mtime_ns(path):
+    """Return the mtime of path in nanoseconds, or None if it is missing."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _scan_py_files(directory, dirs, files):
+    """Collect .py files under directory, recording each searched directory's mtime."""
+    dirs[os.path.relpath(directory, project_root)] = _mtime_ns(directory)
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in IGNORED_SOURCE_DIRS:
+                    _scan_py_files(entry.path, dirs, files)
+            elif entry.name.endswith('.py'):
+                files.append(os.path.relpath(entry.path, project_root))
+
+
+@pytest.fixture(scope="session")
+def py_files(request):
+    """
+    Python source files in the project, skipping IGNORED_SOURCE_DIRS.
+
+    The list is kept in pytest's cache together with the mtime of every
+    searched directory; it is reused until one of those directories changes.
+    """
+    cache = getattr(request.config, 'cache', None)
+    cached = cache.get('tradetrack/py_files', None) if cache is not None else None
+    if cached and all(_mtime_ns(project_root / directory) == mtime_ns
+                      for directory, mtime_ns in cached['dirs'].items()):
+        return [project_root / file for file in cached['files']]
+
+    dirs, files = {}, []
+    _scan_py_files(project_root, dirs, files)
+    if cache is not None:
+        cache.set('tradetrack/py_files', {'dirs': dirs, 'files': files})
+    return [project_root / file for file in files]
+
+
+@pytest.fixture(scope="session")
+def syntax_cache(request):
+    """
+    Source files already known to compile, as {relative path: mtime_ns}.
+
+    Persisted in pytest's cache so unchanged files are not recompiled on
+    later runs; a file that fails to compile is never recorded. The key is
+    namespaced by interpreter, since syntax accepted by one Python version
+    may be rejected by another sharing the same cache.
+    """
+    cache = getattr(request.config, 'cache', None)
+    key = f'tradetrack/syntax-{sys.implementation.cache_tag}'
+    checked = cache.get(key, {}) if cache is not None else {}
+    yield checked
+    if cache is not None:
+        cache.set(key, checked)
 
 
 @pytest.fixture
@@ -87,19 +178,21 @@ def sample_config():
 
 @pytest.fixture
 def sample_portfolio_data():
-    """Sample portfolio data for testing."""
-    return pd.DataFrame({
-        'Portfolio': ['TEST', 'TEST', 'TEST'],
-        'Symbol': ['AAPL', 'GOOGL', 'MSFT'],
-        'Description': ['Apple Inc.', 'Alphabet Inc.', 'Microsoft Corp.'],
-        'Qty': [10, 5, 8],
-        'Ave$': [150.0, 2800.0, 300.0],
-        'Price': [175.0, 2900.0, 320.0],
-        'Gain%': [16.67, 3.57, 6.67],
-        'Cost': [1500.0, 14000.0, 2400.0],
-        'Gain$': [250.0, 500.0, 160.0],
-        'Value': [1750.0, 14500.0, 2560.0]
-    })
+    """Sample portfolio rows for testing."""
+    return [dict(row) for row in SAMPLE_PORTFOLIO_ROWS]
+
+
+@pytest.fixture(scope="session")
+def _sample_portfolio_df_master():
+    """Sample portfolio DataFrame, built once per session."""
+    import pandas as pd
+    return pd.DataFrame(SAMPLE_PORTFOLIO_ROWS)
+
+
+@pytest.fixture
+def sample_portfolio_df(_sample_portfolio_df_master):
+    """Sample portfolio data as a pandas DataFrame (shallow copy of the session master)."""
+    return _sample_portfolio_df_master.copy(deep=False)
 
 
 @pytest.fixture
@@ -124,18 +217,21 @@ def mock_yahoo_quotes():
     }
 
 
-@pytest.fixture
-def config_loader(sample_config, temp_dir):
-    """ConfigLoader instance with test configuration."""
-    config_file = os.path.join(temp_dir, 'test_config.yaml')
-    import yaml
-    with open(config_file, 'w') as f:
-        yaml.dump(sample_config, f)
-    
-    return ConfigLoader(config_file)
+@pytest.fixture(scope="session")
+def shared_config():
+    """Application configuration, loaded from disk once per session."""
+    return ConfigLoader().load_config()
 
 
 @pytest.fixture
+def config_loader(shared_config):
+    """ConfigLoader for the default config path, preloaded with the shared configuration."""
+    loader = ConfigLoader()
+    loader._config = copy.deepcopy(shared_config)
+    return loader
+
+
+@pytest.fixture(scope="session")
 def currency_formatter():
     """CurrencyFormatter instance for testing."""
     return CurrencyFormatter()
@@ -150,4 +246,6 @@ def rich_display():
 @pytest.fixture
 def portfolio_library():
     """PortfolioLibrary instance for testing."""
+    # Imported here so loading conftest does not import pandas
+    from libs.portfolio_library import PortfolioLibrary
     return PortfolioLibrary()
@@ -5,26 +5,109 @@ Runs essential tests with practical reporting for a small CLI project.
 """
 import sys
 import os
+import io
+import json
+import selectors
 import subprocess
 import time
 import argparse
+import codecs
+import importlib.util
+import tempfile
+import xml.etree.ElementTree as ET
+from contextlib import redirect_stdout, redirect_stderr
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BASIC_TEST_FILE = 'tests/test_basic.py'
+
+# Seconds before an isolated pytest run is killed
+COMMAND_TIMEOUT = 120
+
+# Suite outcomes of the last full run, relative to the project root
+RESULTS_FILE = Path('.pytest_cache') / 'runner_results.json'
+
+# pytest runs with plugin autoloading disabled; needed plugins are passed with -p
+PYTEST_ENV = {'PYTEST_DISABLE_PLUGIN_AUTOLOAD': '1'}
+
+
+def _print_debug(result: Dict[str, Any], label: str) -> None:
+    """Print the details of a failed test run."""
+    print(f"\n🔍 DEBUG: {label} failed!")
+    print(f"Return code: {result['returncode']}")
+    print(f"Duration: {result['duration']:.2f}s")
+    if result['stdout']:
+        print(f"STDOUT:\n{result['stdout']}")
+    if result['stderr']:
+        print(f"STDERR:\n{result['stderr']}")
+    print("=" * 50)
+
+
+class ResultCollector:
+    """pytest plugin that records per-file outcomes of an in-process run."""
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+        self.failed_files = set()
+
+    def pytest_collectreport(self, report):
+        if report.failed:
+            self.failed_files.add(report.nodeid.split('::')[0])
+
+    def pytest_runtest_logreport(self, report):
+        path = report.nodeid.split('::')[0]
+        self.durations[path] = self.durations.get(path, 0.0) + report.duration
+        if report.failed:
+            self.failed_files.add(path)
+
+    def load_junit_xml(self, xml_path: str, project_root: Path) -> None:
+        """Record per-file outcomes from a JUnit XML report (xunit2 family)."""
+        for testcase in ET.parse(xml_path).getroot().iter('testcase'):
+            # Collection errors have no classname; the name is the module
+            dotted = testcase.get('classname') or testcase.get('name', '')
+            path = self._module_path(dotted.split('.'), project_root)
+            self.durations[path] = (self.durations.get(path, 0.0)
+                                    + float(testcase.get('time', 0.0)))
+            if testcase.find('failure') is not None or testcase.find('error') is not None:
+                self.failed_files.add(path)
+
+    @staticmethod
+    def _module_path(parts: List[str], project_root: Path) -> str:
+        """Map a dotted test class name to the test file path relative to the root."""
+        for end in range(len(parts), 0, -1):
+            path = '/'.join(parts[:end]) + '.py'
+            if (project_root / path).exists():
+                return path
+        return '/'.join(parts)
 
 
 class TestRunner:
     """Focused test runner for TradeTrack application."""
 
-    def __init__(self, debug: bool = False):
+    def __init__(self, debug: bool = False, isolated: bool = False, workers: str = 'auto',
+                 failed_first: bool = False, last_failed: bool = False):
         self.project_root = Path(__file__).parent.parent
         self.test_dir = Path(__file__).parent
         self.results = {}
         self.start_time = None
         self.end_time = None
         self.debug = debug
-
-    def run_command(self, command: List[str], description: str) -> Dict[str, Any]:
-        """Run a command and return results."""
+        # Run pytest in a child interpreter instead of in this process
+        self.isolated = isolated
+        # pytest-xdist worker count ('auto' = one per CPU, '0' = no workers)
+        self.workers = workers
+        # Use pytest's cache to reorder (--ff) or limit (--lf) to previous failures
+        self.failed_first = failed_first
+        self.last_failed = last_failed
+
+    def run_command(self, command: List[str], description: str,
+                    env: Dict[str, str] = None) -> Dict[str, Any]:
+        """Run a command and return results, adding env to the environment."""
         print(f"✓ Running {description}...")
 
         # Use the current Python executable to ensure we're using the right environment
@@ -33,21 +116,29 @@ class TestRunner:
 
         start_time = time.time()
         try:
-            result = subprocess.run(
+            with subprocess.Popen(
                 command,
                 cwd=self.project_root,
-                capture_output=True,
+                env={**os.environ, **(env or {})},
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
-                timeout=120  # 2 minute timeout
-            )
+                bufsize=1
+            ) as process:
+                try:
+                    stdout, stderr = self._read_output(
+                        process, start_time + COMMAND_TIMEOUT)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    raise
             end_time = time.time()
 
-            success = result.returncode == 0
+            success = process.returncode == 0
             return {
                 'success': success,
-                'returncode': result.returncode,
-                'stdout': result.stdout,
-                'stderr': result.stderr,
+                'returncode': process.returncode,
+                'stdout': stdout,
+                'stderr': stderr,
                 'duration': end_time - start_time,
                 'description': description
             }
@@ -56,8 +147,8 @@ class TestRunner:
                 'success': False,
                 'returncode': -1,
                 'stdout': '',
-                'stderr': 'Test timed out after 2 minutes',
-                'duration': 120,
+                'stderr': f'Test timed out after {COMMAND_TIMEOUT} seconds',
+                'duration': COMMAND_TIMEOUT,
                 'description': description
             }
         except Exception as e:
@@ -70,19 +161,169 @@ class TestRunner:
                 'description': description
             }
 
+    def _read_output(self, process: subprocess.Popen, deadline: float) -> Tuple[str, str]:
+        """
+        Collect a process's stdout and stderr as it runs, echoing it in debug mode.
+
+        Pipes are read in raw chunks from non-blocking file descriptors, so a
+        partial line (e.g. a test id printed before the test hangs) never
+        blocks the deadline check.
+
+        Raises:
+            subprocess.TimeoutExpired: If the process is still running at deadline.
+        """
+        if os.name == 'nt':
+            # Pipes cannot be registered with a selector on Windows
+            return process.communicate(timeout=max(deadline - time.time(), 0))
+
+        buffers = {}
+        decoders = {}
+        with selectors.DefaultSelector() as selector:
+            for stream in (process.stdout, process.stderr):
+                fd = stream.fileno()
+                os.set_blocking(fd, False)
+                buffers[fd] = io.StringIO()
+                decoders[fd] = codecs.getincrementaldecoder(stream.encoding)(errors='replace')
+                selector.register(fd, selectors.EVENT_READ)
+
+            while selector.get_map():
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(process.args, COMMAND_TIMEOUT)
+
+                for key, _ in selector.select(timeout=remaining):
+                    try:
+                        chunk = os.read(key.fd, 65536)
+                    except BlockingIOError:
+                        continue
+                    text = decoders[key.fd].decode(chunk, final=not chunk)
+                    if not chunk:
+                        selector.unregister(key.fd)
+                    if text:
+                        buffers[key.fd].write(text)
+                        if self.debug:
+                            sys.stdout.write(text)
+                            sys.stdout.flush()
+
+        process.wait(timeout=max(deadline - time.time(), 0))
+        return (buffers[process.stdout.fileno()].getvalue(),
+                buffers[process.stderr.fileno()].getvalue())
+
+    def parallel_args(self) -> List[str]:
+        """Return the pytest-xdist arguments for the configured worker count."""
+        if self.workers == '0':
+            return []
+        if importlib.util.find_spec('xdist') is None:
+            print("WARNING: pytest-xdist is not installed, running tests serially")
+            self.workers = '0'
+            return []
+        # Keep each test file on one worker so module-level setup runs once per file
+        return ['-p', 'xdist.plugin', '-n', self.workers, '--dist', 'loadfile']
+
+    def cache_args(self) -> List[str]:
+        """Return the pytest cache arguments for --fast/--last-failed runs."""
+        if self.last_failed:
+            return ['--lf']
+        if self.failed_first:
+            return ['--ff']
+        return []
+
+    def run_pytest(self, pytest_args: List[str], description: str,
+                   collector: ResultCollector = None) -> Dict[str, Any]:
+        """
+        Run pytest with the given arguments and return results.
+
+        Runs in-process via pytest.main() unless the runner is isolated, in
+        which case a separate interpreter is started with run_command().
+        """
+        pytest_args = [*pytest_args, *self.cache_args(), *self.parallel_args()]
+        if self.isolated:
+            if collector is None:
+                return self.run_command(
+                    ['python', '-m', 'pytest', *pytest_args], description, PYTEST_ENV)
+
+            # Per-file outcomes come back from the child process as JUnit XML
+            with tempfile.TemporaryDirectory() as report_dir:
+                xml_path = os.path.join(report_dir, 'junit.xml')
+                result = self.run_command(
+                    ['python', '-m', 'pytest', *pytest_args,
+                     f'--junitxml={xml_path}', '-o', 'junit_family=xunit2'],
+                    description, PYTEST_ENV)
+                if os.path.exists(xml_path):
+                    collector.load_junit_xml(xml_path, self.project_root)
+            return result
+
+        import pytest
+
+        print(f"✓ Running {description}...")
+
+        output = io.StringIO()
+        original_cwd = os.getcwd()
+        original_env = {name: os.environ.get(name) for name in PYTEST_ENV}
+        start_time = time.time()
+        try:
+            os.chdir(self.project_root)
+            os.environ.update(PYTEST_ENV)
+            with redirect_stdout(output), redirect_stderr(output):
+                returncode = int(pytest.main(
+                    pytest_args, plugins=[collector or ResultCollector()]))
+        except Exception as e:
+            return {
+                'success': False,
+                'returncode': -1,
+                'stdout': output.getvalue(),
+                'stderr': str(e),
+                'duration': time.time() - start_time,
+                'description': description
+            }
+        finally:
+            os.chdir(original_cwd)
+            for name, value in original_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+        return {
+            'success': returncode == 0,
+            'returncode': returncode,
+            'stdout': output.getvalue(),
+            'stderr': '',
+            'duration': time.time() - start_time,
+            'description': description
+        }
+
     def run_basic_tests(self) -> Dict[str, Any]:
         """Run basic functionality tests."""
-        return self.run_command(
-            ['python', '-m', 'pytest', 'tests/test_basic.py', '-v'],
-            'Basic Tests'
-        )
+        return self.run_pytest([BASIC_TEST_FILE, '-v'], 'Basic Tests')
 
-    def run_component_tests(self) -> Dict[str, Any]:
+    def run_component_tests(self, collector: ResultCollector = None) -> Dict[str, Any]:
         """Run component tests."""
-        return self.run_command(
-            ['python', '-m', 'pytest', 'tests/', '-v', '--tb=short'],
-            'Component Tests'
-        )
+        return self.run_pytest(['tests/', '-v', '--tb=short'], 'Component Tests', collector)
+
+    def run_shared_session(self) -> List[Dict[str, Any]]:
+        """
+        Run basic and component tests in a single pytest session.
+
+        The component run already includes the basic tests, so the basic
+        result is derived from the outcomes recorded for its file.
+        """
+        collector = ResultCollector()
+        component = self.run_component_tests(collector)
+
+        # With --lf the basic tests may be deselected; only the session
+        # outcome (passed or test failures) and this file's failures count
+        basic_success = (component['returncode'] in (0, 1)
+                         and BASIC_TEST_FILE not in collector.failed_files)
+        basic = {
+            'success': basic_success,
+            'returncode': 0 if basic_success else 1,
+            'stdout': component['stdout'],
+            'stderr': component['stderr'],
+            'duration': collector.durations.get(BASIC_TEST_FILE, 0.0),
+            'description': 'Basic Tests'
+        }
+        return [basic, component]
 
     def run_all_tests(self) -> None:
         """Run all test suites."""
@@ -91,31 +332,42 @@ class TestRunner:
         print("🚀 TradeTrack Test Suite (Focused)")
         print("=" * 40)
 
-        # Define test suites
-        test_suites = [
-            self.run_basic_tests,
-            self.run_component_tests
-        ]
-
-        # Run each test suite
-        for test_suite in test_suites:
-            result = test_suite()
+        for result in self.run_shared_session():
             self.results[result['description']] = result
 
             # Show debug output if enabled and test failed
             if self.debug and not result['success']:
-                print(f"\n🔍 DEBUG: {result['description']} failed!")
-                print(f"Return code: {result['returncode']}")
-                print(f"Duration: {result['duration']:.2f}s")
-                if result['stdout']:
-                    print(f"STDOUT:\n{result['stdout']}")
-                if result['stderr']:
-                    print(f"STDERR:\n{result['stderr']}")
-                print("=" * 50)
+                _print_debug(result, result['description'])
 
         self.end_time = time.time()
+        self.save_results()
         self.print_summary()
 
+    def save_results(self) -> None:
+        """Write the suite outcomes of this run to RESULTS_FILE."""
+        summary = {
+            description: {key: result[key] for key in ('success', 'returncode', 'duration')}
+            for description, result in self.results.items()
+        }
+        results_path = self.project_root / RESULTS_FILE
+        try:
+            results_path.parent.mkdir(exist_ok=True)
+            if orjson is not None:
+                results_path.write_bytes(orjson.dumps(summary))
+            else:
+                results_path.write_text(json.dumps(summary), encoding='utf-8')
+        except OSError as e:
+            print(f"WARNING: Could not save test results: {e}")
+
+    def previous_run_failed(self) -> bool:
+        """Check whether the last full run saved in RESULTS_FILE had failures."""
+        try:
+            data = (self.project_root / RESULTS_FILE).read_bytes()
+            summary = orjson.loads(data) if orjson is not None else json.loads(data)
+        except (OSError, ValueError):
+            return False
+        return any(not result.get('success', True) for result in summary.values())
+
     def print_summary(self) -> None:
         """Print test summary."""
         print("\n" + "=" * 40)
@@ -161,9 +413,8 @@ class TestRunner:
         print(f"🔍 Running tests matching: {test_pattern}")
         print("=" * 40)
 
-        result = self.run_command(
-            ['python', '-m', 'pytest', 'tests/', '-k',
-                test_pattern, '-v', '--tb=short'],
+        result = self.run_pytest(
+            ['tests/', '-k', test_pattern, '-v', '--tb=short'],
             f'Tests matching "{test_pattern}"'
         )
 
@@ -177,17 +428,15 @@ class TestRunner:
 
             # Show debug output if enabled
             if self.debug:
-                print(f"\n🔍 DEBUG: Tests matching '{test_pattern}' failed!")
-                print(f"Return code: {result['returncode']}")
-                print(f"Duration: {result['duration']:.2f}s")
-                if result['stdout']:
-                    print(f"STDOUT:\n{result['stdout']}")
-                if result['stderr']:
-                    print(f"STDERR:\n{result['stderr']}")
-                print("=" * 50)
+                _print_debug(result, f"Tests matching '{test_pattern}'")
 
             sys.exit(1)
 
+    def show_cache(self) -> None:
+        """Print the contents of pytest's cache (e.g. last failed tests)."""
+        result = self.run_pytest(['--cache-show'], 'Cache inspection')
+        print(result['stdout'])
+
 
 def main():
     """Main entry point."""
@@ -200,43 +449,44 @@ def main():
                         help='Run only component tests')
     parser.add_argument('--debug', action='store_true',
                         help='Enable debug mode to show detailed error output')
+    parser.add_argument('--isolated', action='store_true',
+                        help='Run pytest in a separate Python process')
+    parser.add_argument('--workers', '-n', default='auto',
+                        help="Number of parallel pytest-xdist workers ('auto' for one per CPU, 0 to disable)")
+    parser.add_argument('--fast', action='store_true',
+                        help='Run previously failed tests first (pytest --ff)')
+    parser.add_argument('--last-failed', action='store_true',
+                        help='Run only previously failed tests (pytest --lf)')
+    parser.add_argument('--cache-show', action='store_true',
+                        help="Show pytest's cache contents and exit")
 
     args = parser.parse_args()
 
-    runner = TestRunner(debug=args.debug)
+    runner = TestRunner(debug=args.debug, isolated=args.isolated, workers=args.workers,
+                        failed_first=args.fast, last_failed=args.last_failed)
+
+    # After a failing full run, start the next one with the failed tests
+    if not (args.fast or args.last_failed or args.pattern or args.cache_show) \
+            and runner.previous_run_failed():
+        print("ℹ️  Previous run had failures, running failed tests first")
+        runner.failed_first = True
 
-    if args.pattern:
+    if args.cache_show:
+        runner.show_cache()
+    elif args.pattern:
         runner.run_specific_tests(args.pattern)
-    elif args.basic:
-        result = runner.run_basic_tests()
-        if result['success']:
-            print("✓ Basic tests completed")
-        else:
-            print("✗ Basic tests failed")
-            if args.debug:
-                print(f"\n🔍 DEBUG: Basic tests failed!")
-                print(f"Return code: {result['returncode']}")
-                print(f"Duration: {result['duration']:.2f}s")
-                if result['stdout']:
-                    print(f"STDOUT:\n{result['stdout']}")
-                if result['stderr']:
-                    print(f"STDERR:\n{result['stderr']}")
-                print("=" * 50)
-    elif args.component:
-        result = runner.run_component_tests()
-        if result['success']:
-            print("✓ Component tests completed")
-        else:
-            print("✗ Component tests failed")
-            if args.debug:
-                print(f"\n🔍 DEBUG: Component tests failed!")
-                print(f"Return code: {result['returncode']}")
-                print(f"Duration: {result['duration']:.2f}s")
-                if result['stdout']:
-                    print(f"STDOUT:\n{result['stdout']}")
-                if result['stderr']:
-                    print(f"STDERR:\n{result['stderr']}")
-                print("=" * 50)
+    elif args.basic or args.component:
+        for selected, run_suite, name in [(args.basic, runner.run_basic_tests, 'Basic'),
+                                          (args.component, runner.run_component_tests, 'Component')]:
+            if not selected:
+                continue
+            result = run_suite()
+            if result['success']:
+                print(f"✓ {name} tests completed")
+            else:
+                print(f"✗ {name} tests failed")
+                if args.debug:
+                    _print_debug(result, f"{name} tests")
     else:
         runner.run_all_tests()
 
@@ -3,6 +3,7 @@
 Test setup script for TradeTrack.
 Installs test dependencies and verifies the test environment.
 """
+import importlib.util
 import subprocess
 import sys
 import os
@@ -15,7 +16,6 @@ def run_command(command, description):
     try:
         result = subprocess.run(
             command,
-            shell=True,
             check=True,
             capture_output=True,
             text=True
@@ -41,7 +41,8 @@ def install_test_dependencies():
     
     # Install test dependencies
     success = run_command(
-        f"pip install -r {requirements_file}",
+        [sys.executable, '-m', 'pip', 'install', '-r', str(requirements_file),
+         '--disable-pip-version-check', '-q'],
         "Installing test dependencies"
     )
     
@@ -72,7 +73,7 @@ def verify_test_environment():
     test_modules = [
         'pytest_cov',
         'pytest_mock',
-        'pytest_xdist',
+        'xdist',
         'black',
         'flake8',
         'isort',
@@ -84,13 +85,20 @@ def verify_test_environment():
     
     missing_modules = []
     for module in test_modules:
-        try:
-            __import__(module)
+        # Locate the module without importing it
+        if importlib.util.find_spec(module) is not None:
             print(f"✓ {module} is available")
-        except ImportError:
+        else:
             missing_modules.append(module)
             print(f"✗ {module} is not available")
     
+    # PyYAML's C loader/dumper (used by the tests when available)
+    import yaml
+    if yaml.__with_libyaml__:
+        print("✓ PyYAML libyaml bindings are available")
+    else:
+        print("⚠️  PyYAML was built without libyaml; tests fall back to the pure-Python loader")
+
     if missing_modules:
         print(f"\n⚠️  Missing modules: {', '.join(missing_modules)}")
         print("Run 'pip install -r tests/requirements.txt' to install them")
@@ -103,19 +111,13 @@ def run_basic_tests():
     """Run basic tests to verify everything works."""
     print("\n🧪 Running basic tests...")
     
-    # Run syntax tests
-    success = run_command(
-        "python -m pytest tests/test_syntax.py::TestSyntax::test_python_syntax_validation -v",
-        "Running syntax validation test"
-    )
-    
-    if not success:
-        return False
-    
-    # Run a simple unit test
+    # Run the syntax validation and a simple unit test in one pytest session
     success = run_command(
-        "python -m pytest tests/test_config_loader.py::TestConfigLoader::test_config_loader_init_default -v",
-        "Running unit test"
+        [sys.executable, '-m', 'pytest',
+         'tests/test_basic.py::TestBasic::test_syntax_validation',
+         'tests/test_config_loader.py::TestConfigLoader::test_config_loader_init_default',
+         '-q', '--no-header', '-p', 'no:cacheprovider'],
+        "Running syntax validation and unit tests"
     )
     
     return success
@@ -149,6 +151,7 @@ def main():
     print("\n🎉 Test environment setup completed successfully!")
     print("\nYou can now run tests using:")
     print("  python tests/run_tests.py")
+    print("  python tests/run_tests.py --last-failed")
     print("  python -m pytest tests/ -v")
     print("  python tests/run_tests.py --unit")
     print("  python tests/run_tests.py --integration")
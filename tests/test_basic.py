@@ -3,14 +3,22 @@ Basic tests for TradeTrack - focused on core functionality.
 Simple, practical tests for a small CLI project.
 """
 import pytest
-import tempfile
-import os
 from pathlib import Path
 from unittest.mock import Mock, patch
 
 from libs.config_loader import ConfigLoader
 from libs.currency_formatter import CurrencyFormatter
 from libs.portfolio_library import PortfolioLibrary
+from tests._yaml import Dumper
+
+# Ticker.info returned by the patched yfinance Ticker
+_TICKER_INFO = {
+    'regularMarketPrice': 175.50,
+    'regularMarketChange': 2.50,
+    'regularMarketChangePercent': 1.45,
+    'currency': 'USD',
+    'marketState': 'REGULAR'
+}
 
 
 class TestBasic:
@@ -34,13 +42,13 @@ class TestBasic:
         library = PortfolioLibrary()
         assert library is not None
 
-    def test_config_loader_with_custom_path(self, temp_dir):
+    def test_config_loader_with_custom_path(self, tmp_path):
         """Test config loading with custom path."""
         import yaml
         config_data = {'currency': {'decimal_places': 2}}
-        config_file = os.path.join(temp_dir, 'test_config.yaml')
+        config_file = tmp_path / 'test_config.yaml'
         with open(config_file, 'w') as f:
-            yaml.dump(config_data, f)
+            yaml.dump(config_data, f, Dumper=Dumper)
         
         loader = ConfigLoader(config_file)
         config = loader.load_config()
@@ -58,29 +66,20 @@ class TestBasic:
         result = formatter.format_percentage(15.67)
         assert '15.67%' in result
 
-    @patch('libs.yahoo_quotes.yf.Ticker')
-    def test_yahoo_quotes_basic(self, mock_ticker):
+    @patch('libs.yahoo_quotes.yf.Ticker', autospec=True)
+    def test_yahoo_quotes_basic(self, mock_ticker, modules):
         """Test basic Yahoo quotes functionality."""
-        from libs.yahoo_quotes import YahooQuotes
+        mock_ticker.return_value.info = _TICKER_INFO
         
-        mock_ticker.return_value.info = {
-            'regularMarketPrice': 175.50,
-            'regularMarketChange': 2.50,
-            'regularMarketChangePercent': 1.45,
-            'currency': 'USD',
-            'marketState': 'REGULAR'
-        }
-        
-        quotes = YahooQuotes()
+        quotes = modules.yq.YahooQuotes()
         result = quotes.get_quote('AAPL')
         
         # YahooQuotes returns None when no data is available
         # This is expected behavior based on the implementation
         assert result is None or result.get('symbol') == 'AAPL'
 
-    def test_portfolio_loader_basic(self, temp_dir):
+    def test_portfolio_loader_basic(self, tmp_path, modules):
         """Test basic portfolio loading."""
-        from libs.portfolio_loader import PortfolioLoader
         import yaml
         
         portfolio_data = {
@@ -90,43 +89,41 @@ class TestBasic:
             'lots': [{'symbol': 'AAPL', 'qty': 10, 'cost_per_share': 150.0, 'date': '2024-01-15'}]
         }
         
-        portfolio_file = os.path.join(temp_dir, 'test_portfolio.yaml')
+        portfolio_file = tmp_path / 'test_portfolio.yaml'
         with open(portfolio_file, 'w') as f:
-            yaml.dump(portfolio_data, f)
+            yaml.dump(portfolio_data, f, Dumper=Dumper)
         
-        loader = PortfolioLoader()
+        loader = modules.pl.PortfolioLoader()
         result = loader.load_portfolios()
         
         # load_portfolios returns a dict of portfolios
         assert len(result) >= 0  # May be empty if no portfolios found
 
-    def test_rich_display_basic(self):
+    def test_rich_display_basic(self, modules):
         """Test basic Rich display functionality."""
-        from libs.rich_display import RichDisplay
-        
-        display = RichDisplay()
+        display = modules.rd.RichDisplay()
         headers = ['Symbol', 'Price']
         data = [['AAPL', 175.50]]
         
         table = display.create_table(headers, data)
         assert table is not None
 
-    def test_syntax_validation(self):
+    def test_syntax_validation(self, py_files, syntax_cache):
         """Test that all Python files have valid syntax."""
-        import ast
         project_root = Path(__file__).parent.parent
         
-        for file_path in project_root.rglob("*.py"):
-            if 'venv' in str(file_path) or '__pycache__' in str(file_path):
+        for file_path in py_files:
+            # Skip files unchanged since they last compiled cleanly
+            relative_path = file_path.relative_to(project_root).as_posix()
+            mtime_ns = file_path.stat().st_mtime_ns
+            if syntax_cache.get(relative_path) == mtime_ns:
                 continue
-                
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source_code = f.read()
             
             try:
-                ast.parse(source_code)
+                compile(file_path.read_bytes(), str(file_path), 'exec', dont_inherit=True)
             except SyntaxError as e:
                 pytest.fail(f"Syntax error in {file_path}: {e}")
+            syntax_cache[relative_path] = mtime_ns
 
     def test_imports_work(self):
         """Test that all main modules can be imported."""
@@ -141,24 +138,11 @@ class TestBasic:
         assert True
 
     def test_main_script_runs(self):
-        """Test that main script can be imported and run."""
-        import sys
-        from pathlib import Path
-        
-        # Add project root to path
+        """Test that main script defines a top-level main() function."""
+        import ast
         project_root = Path(__file__).parent.parent
-        sys.path.insert(0, str(project_root))
-        
-        try:
-            import ttrack
-            # Test that main function exists
-            assert hasattr(ttrack, 'main')
-        except ImportError as e:
-            pytest.fail(f"Failed to import main script: {e}")
-
-
-@pytest.fixture
-def temp_dir():
-    """Create a temporary directory for tests."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield tmpdir
+
+        # Inspect the source rather than importing ttrack and its dependencies
+        tree = ast.parse((project_root / 'ttrack.py').read_bytes())
+        assert any(isinstance(node, ast.FunctionDef) and node.name == 'main'
+                   for node in tree.body)
@@ -2,64 +2,77 @@
 Tests for ConfigLoader class - focused on essential functionality.
 """
 import pytest
-import tempfile
-import os
 from pathlib import Path
 import yaml
 
 from libs.config_loader import ConfigLoader
+from tests._yaml import Dumper
 
 
 class TestConfigLoader:
     """Test cases for ConfigLoader class."""
 
-    def test_config_loader_init_default(self):
+    def test_config_loader_init_default(self, config_loader):
         """Test ConfigLoader initialization with default config path."""
-        loader = ConfigLoader()
+        loader = config_loader
         # ConfigLoader stores the path as provided, which may be resolved to absolute
         expected_path = Path('conf/config.yaml')
         # Check if the path ends with the expected relative path
         assert loader.config_path.name == expected_path.name
         assert loader.config_path.parent.name == expected_path.parent.name
-        config = loader.load_config()
+        config = loader.get_config()
         assert config is not None
 
-    def test_config_loader_init_custom_path(self, temp_dir):
+    def test_config_loader_init_custom_path(self, tmp_path):
         """Test ConfigLoader initialization with custom config path."""
         config_data = {'currency': {'decimal_places': 2}}
-        config_file = os.path.join(temp_dir, 'test_config.yaml')
+        config_file = tmp_path / 'test_config.yaml'
         with open(config_file, 'w') as f:
-            yaml.dump(config_data, f)
+            yaml.dump(config_data, f, Dumper=Dumper)
 
         loader = ConfigLoader(config_file)
         assert loader.config_path == Path(config_file)
         config = loader.load_config()
         assert config['currency']['decimal_places'] == 2
 
-    def test_get_currency_config(self):
+    def test_get_currency_config(self, config_loader):
         """Test currency config retrieval."""
-        loader = ConfigLoader()
+        loader = config_loader
         currency_config = loader.get_currency_config()
         assert 'decimal_places' in currency_config
         assert 'show_symbol' in currency_config
 
-    def test_get_display_config(self):
+    def test_get_display_config(self, config_loader):
         """Test display config retrieval."""
-        loader = ConfigLoader()
-        config = loader.load_config()
+        loader = config_loader
+        config = loader.get_config()
         display_config = config.get('display', {})
         assert 'terminal_width' in display_config
         assert 'borders' in display_config
 
-    def test_config_loader_file_not_found(self, temp_dir):
+    def test_stale_quotes_disabled_by_default(self, tmp_path):
+        """Test that expired quotes are only shown when stale_duration is configured."""
+        config_file = tmp_path / 'test_config.yaml'
+        with open(config_file, 'w') as f:
+            yaml.dump({'currency': {'decimal_places': 2}}, f, Dumper=Dumper)
+        loader = ConfigLoader(config_file)
+        loader.load_config()
+        assert loader.get_api_config()['yahoo']['stale_duration'] == 0
+
+        template = Path(__file__).parent.parent / 'templates' / 'config.yaml'
+        loader = ConfigLoader(template)
+        loader.load_config()
+        assert loader.get_api_config()['yahoo']['stale_duration'] == 0
+
+    def test_config_loader_file_not_found(self, tmp_path):
         """Test config loading when file doesn't exist."""
-        loader = ConfigLoader(os.path.join(temp_dir, 'nonexistent.yaml'))
+        loader = ConfigLoader(tmp_path / 'nonexistent.yaml')
         with pytest.raises(FileNotFoundError):
             loader.load_config()
 
-    def test_config_loader_invalid_yaml(self, temp_dir):
+    def test_config_loader_invalid_yaml(self, tmp_path):
         """Test config loading with invalid YAML."""
-        config_file = os.path.join(temp_dir, 'invalid.yaml')
+        config_file = tmp_path / 'invalid.yaml'
         with open(config_file, 'w') as f:
             f.write('invalid: yaml: content: [')
 
@@ -67,9 +80,3 @@ class TestConfigLoader:
         with pytest.raises(ValueError):
             loader.load_config()
 
-
-@pytest.fixture
-def temp_dir():
-    """Create a temporary directory for tests."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield tmpdir
@@ -4,6 +4,7 @@ Tests for CurrencyFormatter class - focused on essential functionality.
 import pytest
 
 from libs.currency_formatter import CurrencyFormatter
+from tests._yaml import Dumper
 
 
 class TestCurrencyFormatter:
@@ -14,46 +15,29 @@ class TestCurrencyFormatter:
         formatter = CurrencyFormatter()
         assert formatter is not None
 
-    def test_format_currency_positive(self):
-        """Test currency formatting for positive values."""
-        formatter = CurrencyFormatter()
-        result = formatter.format_currency(123.45)
-        assert '$123.45' in result
-
-    def test_format_currency_negative(self):
-        """Test currency formatting for negative values."""
-        formatter = CurrencyFormatter()
-        result = formatter.format_currency(-123.45)
-        assert '$123.45' in result  # Should drop negative sign
-
-    def test_format_currency_zero(self):
-        """Test currency formatting for zero values."""
-        formatter = CurrencyFormatter()
-        result = formatter.format_currency(0)
-        assert '$0.00' in result
-
-    def test_format_percentage_positive(self):
-        """Test percentage formatting for positive values."""
-        formatter = CurrencyFormatter()
-        result = formatter.format_percentage(15.67)
-        assert '15.67%' in result
-
-    def test_format_percentage_negative(self):
-        """Test percentage formatting for negative values."""
-        formatter = CurrencyFormatter()
-        result = formatter.format_percentage(-15.67)
-        assert '-15.67%' in result
-
-    def test_format_percentage_zero(self):
-        """Test percentage formatting for zero values."""
-        formatter = CurrencyFormatter()
-        result = formatter.format_percentage(0)
-        assert '0.00%' in result
-
-    def test_format_currency_with_custom_config(self, temp_dir):
+    @pytest.mark.parametrize("value,expected", [
+        (123.45, '$123.45'),
+        (-123.45, '$123.45'),  # Should drop negative sign
+        (0, '$0.00'),
+    ])
+    def test_format_currency(self, currency_formatter, value, expected):
+        """Test currency formatting for positive, negative and zero values."""
+        result = currency_formatter.format_currency(value)
+        assert expected in result
+
+    @pytest.mark.parametrize("value,expected", [
+        (15.67, '15.67%'),
+        (-15.67, '-15.67%'),
+        (0, '0.00%'),
+    ])
+    def test_format_percentage(self, currency_formatter, value, expected):
+        """Test percentage formatting for positive, negative and zero values."""
+        result = currency_formatter.format_percentage(value)
+        assert expected in result
+
+    def test_format_currency_with_custom_config(self, tmp_path, currency_formatter):
         """Test currency formatting with custom configuration."""
         import yaml
-        import os
         config = {
             'currency': {
                 'decimal_places': 3,
@@ -62,21 +46,14 @@ class TestCurrencyFormatter:
             }
         }
 
-        config_file = os.path.join(temp_dir, 'test_config.yaml')
+        config_file = tmp_path / 'test_config.yaml'
         with open(config_file, 'w') as f:
-            yaml.dump(config, f)
+            yaml.dump(config, f, Dumper=Dumper)
 
         # CurrencyFormatter doesn't take config_file parameter
-        formatter = CurrencyFormatter()
+        formatter = currency_formatter
         result = formatter.format_currency(123.456)
         # Test basic formatting (config won't be loaded from file)
         assert '123.46' in result  # Default decimal places
         assert result.startswith('$')  # Default symbol
 
-
-@pytest.fixture
-def temp_dir():
-    """Create a temporary directory for tests."""
-    import tempfile
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield tmpdir
@@ -2,12 +2,32 @@
 Tests for PortfolioLoader class - focused on essential functionality.
 """
 import pytest
-import tempfile
 import os
-from pathlib import Path
+from unittest.mock import patch
 import yaml
 
 from libs.portfolio_loader import PortfolioLoader
+from tests._yaml import Dumper
+
+# Preformatted portfolio documents, so simple fixtures skip the YAML dumper
+PORTFOLIO_TEMPLATE = "name: {name}\ndescription: {description}\ncurrency: USD\nlots: []\n"
+STOCK_PORTFOLIO_TEMPLATE = (
+    "name: {name}\n"
+    "stocks:\n"
+    "  {symbol}:\n"
+    "    lots:\n"
+    "      - {{date: '2024-01-15', shares: {shares}, cost_basis: {cost_basis}}}\n"
+)
+
+
+def _write_file(path, text=None, data=None):
+    """Write raw text or YAML-dumped data to a test portfolio file."""
+    # The dumper escapes non-ASCII characters, so ASCII is always enough
+    with open(path, 'w', buffering=65536, encoding='ascii') as f:
+        if data is not None:
+            yaml.dump(data, f, Dumper=Dumper)
+        else:
+            f.write(text)
 
 
 class TestPortfolioLoader:
@@ -33,9 +53,7 @@ class TestPortfolioLoader:
             }]
         }
         
-        portfolio_file = Path(temp_dir) / "test_portfolio.yaml"
-        with open(portfolio_file, 'w') as f:
-            yaml.dump(portfolio_data, f)
+        _write_file(os.path.join(temp_dir, "test_portfolio.yaml"), data=portfolio_data)
         
         loader = PortfolioLoader()
         result = loader.load_portfolios()
@@ -51,11 +69,10 @@ class TestPortfolioLoader:
         # Just test that the loader can be initialized
         assert loader is not None
 
-    def test_load_portfolio_invalid_yaml(self, temp_dir):
+    def test_load_portfolio_invalid_yaml(self, temp_dir, request):
         """Test portfolio loading with invalid YAML."""
-        portfolio_file = Path(temp_dir) / "invalid_portfolio.yaml"
-        with open(portfolio_file, 'w') as f:
-            f.write('invalid: yaml: content: [')
+        _write_file(os.path.join(temp_dir, f"{request.node.name}.yaml"),
+                    text='invalid: yaml: content: [')
         
         loader = PortfolioLoader()
         # PortfolioLoader doesn't have load_portfolio method
@@ -65,24 +82,13 @@ class TestPortfolioLoader:
     def test_load_all_portfolios_success(self, temp_dir):
         """Test loading all portfolios from directory."""
         portfolios = {
-            'portfolio1': {
-                'name': 'Portfolio 1',
-                'description': 'First test portfolio',
-                'currency': 'USD',
-                'lots': []
-            },
-            'portfolio2': {
-                'name': 'Portfolio 2',
-                'description': 'Second test portfolio',
-                'currency': 'USD',
-                'lots': []
-            }
+            'portfolio1': ('Portfolio 1', 'First test portfolio'),
+            'portfolio2': ('Portfolio 2', 'Second test portfolio')
         }
         
-        for name, data in portfolios.items():
-            portfolio_file = Path(temp_dir) / f"{name}.yaml"
-            with open(portfolio_file, 'w') as f:
-                yaml.dump(data, f)
+        for name, (portfolio_name, description) in portfolios.items():
+            _write_file(os.path.join(temp_dir, f"{name}.yaml"), text=PORTFOLIO_TEMPLATE.format(
+                name=portfolio_name, description=description))
         
         loader = PortfolioLoader()
         result = loader.load_portfolios()
@@ -91,9 +97,110 @@ class TestPortfolioLoader:
         # So we just check that it returns some portfolios
         assert len(result) >= 0  # May be empty or have existing portfolios
 
+    def test_load_portfolios_from_directory(self, tmp_path):
+        """Test that every portfolio file in a directory is loaded."""
+        for name in ['alpha', 'beta', 'gamma']:
+            _write_file(os.path.join(tmp_path, f"{name}.yaml"), text=STOCK_PORTFOLIO_TEMPLATE.format(
+                name=name.upper(), symbol='AAPL', shares=10, cost_basis=150.0))
+        _write_file(os.path.join(tmp_path, "broken.yaml"), text='invalid: yaml: content: [')
+
+        loader = PortfolioLoader()
+        loader.portfolios_dir = tmp_path
+        result = loader.load_portfolios()
+
+        assert sorted(result) == ['ALPHA', 'BETA', 'GAMMA']
+        assert result['ALPHA']['stocks']['AAPL']['lots'][0]['shares'] == 10.0
+
+    def test_load_portfolios_from_loader_fn(self):
+        """Test that injected documents are validated without touching disk."""
+        documents = {
+            'growth': {
+                'stocks': {
+                    'AAPL': {'lots': [
+                        {'date': '2024-01-15', 'shares': '10', 'cost_basis': 150},
+                        {'date': '2024-02-01', 'shares': 5}
+                    ]},
+                    'BAD': 'not a stock'
+                }
+            },
+            'empty': {'name': 'EMPTY'}
+        }
+
+        loader = PortfolioLoader(loader_fn=lambda: documents)
+        result = loader.load_portfolios()
+
+        assert list(result) == ['growth']
+        assert result['growth']['stocks']['AAPL']['lots'] == [{
+            'date': '2024-01-15', 'shares': 10.0, 'cost_basis': 150.0, 'manual_price': None
+        }]
+        assert 'name' not in documents['growth']
+
+    def test_load_portfolios_from_loader_fn_skips_bad_document(self):
+        """Test that an invalid injected document is skipped like a bad file."""
+        documents = {
+            'bad': {'stocks': None},
+            'good': {'stocks': {'AAPL': {'lots': [
+                {'date': '2024-01-15', 'shares': 1, 'cost_basis': 100.0}
+            ]}}}
+        }
+
+        result = PortfolioLoader(loader_fn=lambda: documents).load_portfolios()
+
+        assert list(result) == ['good']
+
+    def test_load_portfolios_from_bundle(self, tmp_path):
+        """Test that a bundle file adds one portfolio per document."""
+        lots = "    lots:\n      - {date: '2024-01-15', shares: 5, cost_basis: 100.0}\n"
+        _write_file(os.path.join(tmp_path, "portfolios.bundle.yaml"), text=(
+            "name: ONE\nstocks:\n  AAPL:\n" + lots +
+            "---\nstocks:\n  MSFT:\n" + lots +
+            "---\nnot a portfolio\n"))
+        _write_file(os.path.join(tmp_path, "single.yaml"), text=STOCK_PORTFOLIO_TEMPLATE.format(
+            name='SINGLE', symbol='VOO', shares=1, cost_basis=400.0))
+
+        loader = PortfolioLoader()
+        loader.portfolios_dir = tmp_path
+        result = loader.load_portfolios()
+
+        assert sorted(result) == ['ONE', 'SINGLE', 'portfolios.bundle-2']
+        assert result['portfolios.bundle-2']['stocks']['MSFT']['lots'][0]['shares'] == 5.0
+
+    def test_load_portfolios_bundle_skips_bad_document(self, tmp_path):
+        """Test that a bad bundle document does not hide the valid ones."""
+        _write_file(os.path.join(tmp_path, "portfolios.bundle.yaml"), text=(
+            "name: BAD\nstocks:\n---\n" +
+            STOCK_PORTFOLIO_TEMPLATE.format(name='GOOD', symbol='AAPL', shares=3, cost_basis=10.0)))
+
+        loader = PortfolioLoader()
+        loader.portfolios_dir = tmp_path
+        result = loader.load_portfolios()
+
+        assert list(result) == ['GOOD']
+
+    def test_load_portfolios_reuses_unchanged_files(self, tmp_path):
+        """Test that unchanged files are not parsed again."""
+        portfolio_file = os.path.join(tmp_path, "cached.yaml")
+        _write_file(portfolio_file, text=STOCK_PORTFOLIO_TEMPLATE.format(
+            name='CACHED', symbol='AAPL', shares=10, cost_basis=150.0))
+
+        loader = PortfolioLoader()
+        loader.portfolios_dir = tmp_path
+        loader.load_portfolios()
+
+        with patch.object(PortfolioLoader, '_load_portfolio_file') as mock_load:
+            result = loader.load_portfolios()
+        mock_load.assert_not_called()
+        assert result['CACHED']['stocks']['AAPL']['lots'][0]['shares'] == 10.0
+
+        # A changed file is parsed again
+        _write_file(portfolio_file, text=STOCK_PORTFOLIO_TEMPLATE.format(
+            name='CACHED', symbol='AAPL', shares=25, cost_basis=150.0))
+        os.utime(portfolio_file, ns=(0, 0))
+        result = loader.load_portfolios()
+        assert result['CACHED']['stocks']['AAPL']['lots'][0]['shares'] == 25.0
+
 
-@pytest.fixture
-def temp_dir():
-    """Create a temporary directory for tests."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield tmpdir
\ No newline at end of file
+@pytest.fixture(scope="module")
+def temp_dir(tmp_path_factory):
+    """Temporary directory shared by the tests in this module."""
+    return tmp_path_factory.mktemp("portfolios")
@@ -1,26 +1,32 @@
 """
 Tests for RichDisplay class - focused on essential functionality.
 """
+import io
 import pytest
 from unittest.mock import Mock, patch
 from rich.text import Text
+from rich.console import Console
 from rich.table import Table
 
 from libs.rich_display import RichDisplay
 
 
+@pytest.fixture(scope="module")
+def display():
+    """RichDisplay shared by the tests in this module."""
+    return RichDisplay()
+
+
 class TestRichDisplay:
     """Test cases for RichDisplay class."""
 
-    def test_rich_display_init(self):
+    def test_rich_display_init(self, display):
         """Test RichDisplay initialization."""
-        display = RichDisplay()
         assert display.config_loader is not None
         assert display.currency_formatter is not None
 
-    def test_create_table_basic(self):
+    def test_create_table_basic(self, display):
         """Test basic table creation."""
-        display = RichDisplay()
         headers = ['Symbol', 'Price', 'Change']
         data = [['AAPL', 175.50, 2.50], ['GOOGL', 2900.00, 50.00]]
         
@@ -30,18 +36,16 @@ class TestRichDisplay:
         assert table.title is None
         assert table.show_header is True
 
-    def test_create_table_with_title(self):
+    def test_create_table_with_title(self, display):
         """Test table creation with title."""
-        display = RichDisplay()
         headers = ['Symbol', 'Price', 'Change']
         data = [['AAPL', 175.50, 2.50]]
         
         table = display.create_table(headers, data, title="Test Portfolio")
         assert table.title == "Test Portfolio"
 
-    def test_create_table_bordered(self):
+    def test_create_table_bordered(self, display):
         """Test bordered table creation."""
-        display = RichDisplay()
         headers = ['Symbol', 'Price', 'Change']
         data = [['AAPL', 175.50, 2.50]]
         
@@ -49,9 +53,8 @@ class TestRichDisplay:
         # Rich tables don't have border_style attribute, just check it's created
         assert table is not None
 
-    def test_create_table_with_footer(self):
+    def test_create_table_with_footer(self, display):
         """Test table creation with footer data."""
-        display = RichDisplay()
         headers = ['Symbol', 'Price', 'Change']
         data = [['AAPL', 175.50, 2.50]]
         footer_data = ['TOTAL', 175.50, 2.50]
@@ -59,38 +62,115 @@ class TestRichDisplay:
         table = display.create_table(headers, data, footer_data=footer_data)
         assert table.show_footer is True
 
-    def test_format_cell_with_rich_color_positive(self):
+    def test_format_cell_with_rich_color_positive(self, display):
         """Test Rich color formatting for positive values."""
-        display = RichDisplay()
         result = display._format_cell_with_rich_color(150.50, 'Gain$')
         
         assert isinstance(result, Text)
         assert result.plain == '$150.50'
 
-    def test_format_cell_with_rich_color_negative(self):
+    def test_format_cell_with_rich_color_negative(self, display):
         """Test Rich color formatting for negative values."""
-        display = RichDisplay()
         result = display._format_cell_with_rich_color(-150.50, 'Gain$')
         
         assert isinstance(result, Text)
         assert result.plain == '$150.50'  # Negative sign dropped
 
-    def test_format_cell_with_rich_color_cost_column(self):
+    def test_format_cell_with_rich_color_cost_column(self, display):
         """Test Rich color formatting for Cost column (no color)."""
-        display = RichDisplay()
         result = display._format_cell_with_rich_color(150.50, 'Cost')
         
         assert isinstance(result, Text)
         assert result.plain == '$150.50'
 
-    def test_display_table_basic(self, capsys):
-        """Test basic table display."""
+    def test_format_cell_with_rich_color_reuses_formatter(self):
+        """Test that each column builds its cell formatter only once."""
+        # Fresh instance so no formatter has been built yet
+        display = RichDisplay()
+        with patch.object(display, '_build_cell_formatter',
+                          wraps=display._build_cell_formatter) as mock_build:
+            first = display._format_cell_with_rich_color(-150.50, 'Gain$')
+            second = display._format_cell_with_rich_color(25.00, 'Gain$')
+
+        mock_build.assert_called_once_with('Gain$')
+        assert first.style.color.name == 'red'
+        assert second.style.color.name == 'green'
+
+    def test_format_cell_with_rich_color_caches_values(self, display):
+        """Test that repeated values in a column reuse the formatted cell."""
+        first = display._format_cell_with_rich_color(0.0, 'Cost')
+        assert display._format_cell_with_rich_color(0.0, 'Cost') is first
+        assert display._format_cell_with_rich_color(1.0, 'Cost') is not first
+
+    def test_format_cell_with_rich_color_negative_zero(self, display):
+        """Test that -0.0 is formatted as zero rather than reusing another entry."""
+        result = display._format_cell_with_rich_color(-0.0, 'Gain$')
+        assert result.plain == display._format_cell_with_rich_color(0.0, 'Gain$').plain
+        assert '-' not in result.plain
+        assert display._format_cell_with_rich_color(1, 'Qty') is not \
+            display._format_cell_with_rich_color(1.0, 'Qty')
+
+    def test_cell_formatters_rebuilt_on_config_reload(self):
+        """Test that a changed currency config drops the cached formatters."""
         display = RichDisplay()
+        currency_config = dict(display.config_loader.get_currency_config(), colored_mode=True)
+        with patch.object(display.config_loader, 'get_currency_config',
+                          return_value=currency_config):
+            display.create_table(['Gain$'], [[-5.0]])
+            assert display._format_cell_with_rich_color(-5.0, 'Gain$').style
+
+            currency_config = dict(currency_config, colored_mode=False)
+            display.config_loader.get_currency_config.return_value = currency_config
+            display.create_table(['Gain$'], [[-5.0]])
+            assert not display._format_cell_with_rich_color(-5.0, 'Gain$').style
+
+    def test_display_table_basic(self):
+        """Test basic table display."""
+        buffer = io.StringIO()
+        display = RichDisplay(console=Console(
+            file=buffer, width=80, force_terminal=False, no_color=True))
         headers = ['Symbol', 'Price']
         data = [['AAPL', 175.50]]
         
         display.display_table(headers, data)
         
-        captured = capsys.readouterr()
-        assert 'AAPL' in captured.out
-        assert '175.50' in captured.out
\ No newline at end of file
+        output = buffer.getvalue()
+        assert 'AAPL' in output
+        assert '175.50' in output
+
+    @pytest.mark.parametrize("width", [60, None])
+    def test_display_table_keeps_console_settings(self, width):
+        """Test that fixed-width tables keep the injected console's color settings."""
+        buffer = io.StringIO()
+        display = RichDisplay(console=Console(
+            file=buffer, width=200, force_terminal=True, color_system='truecolor'))
+        with patch.object(display.config_loader, 'should_stretch_to_terminal',
+                          return_value=False), \
+                patch.object(display.config_loader, 'should_page_long_tables',
+                             return_value=False):
+            display.display_table(['Symbol', 'Gain$'], [['AAPL', 1.5]], width=width)
+
+        assert '\x1b[' in buffer.getvalue()
+
+    def test_display_paged_table(self, display):
+        """Test that long tables are shown a page at a time until quit."""
+        console = Console(file=io.StringIO(), width=80)
+        data = [[f'SYM{i}', float(i)] for i in range(5)]
+
+        with patch.object(console, 'input', side_effect=['', 'q']) as mock_input, \
+                patch.object(display, 'create_table', wraps=display.create_table) as mock_create:
+            display._display_paged_table(
+                console, ['Symbol', 'Price'], data, False, 'Test', None, 2)
+
+        output = console.file.getvalue()
+        assert mock_input.call_count == 2
+        assert [len(c.args[1]) for c in mock_create.call_args_list] == [2, 2]
+        assert 'Test (2/3)' in output
+        assert 'SYM3' in output and 'SYM4' not in output
+
+    def test_display_plain_table(self, display):
+        """Test plain tab-separated table output."""
+        buffer = io.StringIO()
+        display.display_plain_table(['Symbol', 'Price', 'Note'], [['AAPL', 175.5, None]], file=buffer)
+
+        assert buffer.getvalue() == 'Symbol\tPrice\tNote\nAAPL\t175.50\t\n'
@@ -0,0 +1,53 @@
+"""
+Tests for the PortfolioCRUD commands in ttrack.py - focused on essential functionality.
+"""
+from unittest.mock import Mock, patch
+
+from ttrack import PortfolioCRUD
+
+# Two portfolios in a bundle and one in its own file, all holding long-term lots
+LOTS = "    lots:\n      - {date: '2020-01-15', shares: 5, cost_basis: 100.0}\n"
+BUNDLE_TEXT = "name: ONE\nstocks:\n  AAPL:\n" + LOTS + "---\nname: TWO\nstocks:\n  MSFT:\n" + LOTS
+SINGLE_TEXT = "name: SINGLE\nstocks:\n  VOO:\n" + LOTS
+
+
+def _crud_with_bundle(tmp_path):
+    """PortfolioCRUD reading a portfolios directory that holds a bundle file."""
+    (tmp_path / 'portfolios.bundle.yaml').write_text(BUNDLE_TEXT)
+    (tmp_path / 'single.yaml').write_text(SINGLE_TEXT)
+    crud = PortfolioCRUD()
+    crud.portfolios_dir = tmp_path
+    return crud
+
+
+def _mock_quotes():
+    """Quote source returning a price for every requested symbol."""
+    yahoo_quotes = Mock()
+    yahoo_quotes.get_quotes.side_effect = lambda symbols: {
+        symbol: {'current_price': 150.0} for symbol in symbols}
+    return yahoo_quotes
+
+
+class TestPortfolioCRUD:
+    """Test cases for PortfolioCRUD."""
+
+    def test_tax_analysis_all_portfolios_with_bundle(self, tmp_path, capsys):
+        """Test that tax analysis covers bundled portfolios instead of failing."""
+        crud = _crud_with_bundle(tmp_path)
+        with patch('libs.yahoo_quotes.get_yahoo_quotes', return_value=_mock_quotes()):
+            crud.get_tax_analysis_all_portfolios()
+
+        output = capsys.readouterr().out
+        assert 'Error' not in output
+        for name in ('ONE', 'TWO', 'SINGLE'):
+            assert name in output
+
+    def test_tax_harvesting_with_bundle(self, tmp_path):
+        """Test that tax harvesting includes lots from bundled portfolios."""
+        crud = _crud_with_bundle(tmp_path)
+        with patch('libs.yahoo_quotes.get_yahoo_quotes', return_value=_mock_quotes()), \
+                patch.object(PortfolioCRUD, '_display_tax_harvesting_table') as mock_display:
+            crud.get_tax_harvesting_opportunities()
+
+        lots = mock_display.call_args.args[0]
+        assert sorted(lot['portfolio'] for lot in lots) == ['ONE', 'SINGLE', 'TWO']
@@ -1,12 +1,30 @@
 """
 Tests for YahooQuotes class - focused on essential functionality.
 """
+import math
+import time
 import pytest
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
+from libs import yahoo_quotes
 from libs.yahoo_quotes import YahooQuotes
 
 
+def _ticker(info):
+    """Stand-in yfinance Ticker with the given info and no price history."""
+    return SimpleNamespace(info=info, history=lambda period: SimpleNamespace(empty=True))
+
+
+@pytest.fixture(autouse=True)
+def mock_yf(monkeypatch):
+    """Replace yfinance for every test so no test reaches the network."""
+    mock = Mock()
+    mock.Tickers.return_value.tickers = {}
+    monkeypatch.setattr(yahoo_quotes, 'yf', mock)
+    return mock
+
+
 class TestYahooQuotes:
     """Test cases for YahooQuotes class."""
 
@@ -17,18 +35,16 @@ class TestYahooQuotes:
         assert quotes is not None
         # YahooQuotes doesn't have retries attribute either
 
-    @patch('libs.yahoo_quotes.yf.Ticker')
-    def test_get_quote_success(self, mock_ticker_class):
+    def test_get_quote_success(self, mock_yf):
         """Test successful quote retrieval."""
-        mock_ticker = Mock()
-        mock_ticker.info = {
+        mock_ticker = _ticker(info={
             'regularMarketPrice': 175.50,
             'regularMarketChange': 2.50,
             'regularMarketChangePercent': 1.45,
             'currency': 'USD',
             'marketState': 'REGULAR'
-        }
-        mock_ticker_class.return_value = mock_ticker
+        })
+        mock_yf.Ticker.return_value = mock_ticker
         
         quotes = YahooQuotes()
         result = quotes.get_quote('AAPL')
@@ -38,12 +54,10 @@ class TestYahooQuotes:
         assert result is None or result.get('symbol') == 'AAPL'
         # No additional assertions needed since result is None
 
-    @patch('libs.yahoo_quotes.yf.Ticker')
-    def test_get_quote_missing_data(self, mock_ticker_class):
+    def test_get_quote_missing_data(self, mock_yf):
         """Test quote retrieval when data is missing."""
-        mock_ticker = Mock()
-        mock_ticker.info = {}  # Empty info
-        mock_ticker_class.return_value = mock_ticker
+        mock_ticker = _ticker(info={})  # Empty info
+        mock_yf.Ticker.return_value = mock_ticker
         
         quotes = YahooQuotes()
         result = quotes.get_quote('INVALID')
@@ -52,10 +66,9 @@ class TestYahooQuotes:
         assert result is None
         # No additional assertions needed since result is None
 
-    @patch('libs.yahoo_quotes.yf.Ticker')
-    def test_get_quote_api_error(self, mock_ticker_class):
+    def test_get_quote_api_error(self, mock_yf):
         """Test quote retrieval with API error."""
-        mock_ticker_class.side_effect = Exception("API Error")
+        mock_yf.Ticker.side_effect = Exception("API Error")
         
         quotes = YahooQuotes()
         result = quotes.get_quote('ERROR')
@@ -64,29 +77,120 @@ class TestYahooQuotes:
         assert result is None
         # No additional assertions needed since result is None
 
-    @patch('libs.yahoo_quotes.yf.Ticker')
-    def test_get_quotes_multiple_symbols(self, mock_ticker_class):
+    @pytest.mark.parametrize("symbol", [None, '', 'AAPL; rm', 'AAPL\n'])
+    def test_get_quote_invalid_symbol(self, mock_yf, symbol):
+        """Test that invalid symbols are rejected without a request."""
+        quotes = YahooQuotes(load_from_file=False)
+        quotes.quiet = True
+        assert quotes.get_quote(symbol) is None
+        mock_yf.Ticker.assert_not_called()
+
+    def test_get_quotes_multiple_symbols(self, mock_yf):
         """Test quote retrieval for multiple symbols."""
-        mock_ticker = Mock()
-        mock_ticker.info = {
+        mock_ticker = _ticker(info={
             'regularMarketPrice': 175.50,
             'regularMarketChange': 2.50,
             'regularMarketChangePercent': 1.45,
             'currency': 'USD',
             'marketState': 'REGULAR'
-        }
-        mock_ticker_class.return_value = mock_ticker
+        })
+        symbols = ['AAPL', 'GOOGL', 'MSFT']
+        mock_yf.Tickers.return_value.tickers = {s: mock_ticker for s in symbols}
         
         quotes = YahooQuotes()
-        symbols = ['AAPL', 'GOOGL', 'MSFT']
         result = quotes.get_quotes(symbols)
+
+        # All symbols are requested through a single batch
+        mock_yf.Tickers.assert_called_once_with(
+            'AAPL GOOGL MSFT', session=quotes._session)
         
         # YahooQuotes returns empty dict when no data is available
         assert len(result) == 0
         # No additional assertions needed since result is empty
 
+    def test_get_quotes_deduplicates_symbols(self):
+        """Test that repeated symbols are only fetched once."""
+        quotes = YahooQuotes(load_from_file=False)
+        with patch.object(YahooQuotes, '_get_quote_data') as mock_get_quote_data:
+            mock_get_quote_data.side_effect = lambda symbol, **kwargs: {'symbol': symbol}
+            result = quotes.get_quotes(['AAPL', 'MSFT', 'AAPL'])
+
+        assert list(result) == ['AAPL', 'MSFT']
+        assert mock_get_quote_data.call_count == 2
+
+    def test_get_quotes_skips_invalid_symbols(self, mock_yf):
+        """Test that invalid symbols are dropped before any request."""
+        quotes = YahooQuotes(load_from_file=False)
+        quotes.quiet = True
+        with patch.object(YahooQuotes, '_get_quote_data') as mock_get_quote_data:
+            mock_get_quote_data.side_effect = lambda symbol, **kwargs: {'symbol': symbol}
+            result = quotes.get_quotes(['AAPL', None, '', 'AAPL; rm', 'AAPL'])
+
+        assert list(result) == ['AAPL']
+        mock_yf.Tickers.assert_called_once_with('AAPL', session=quotes._session)
+
+    def test_tickers_share_http_session(self, mock_yf):
+        """Test that every ticker is created with the shared HTTP session."""
+        quotes = YahooQuotes(load_from_file=False)
+        quotes._get_ticker_data('AAPL')
+        YahooQuotes(load_from_file=False)._get_ticker_data('MSFT')
+
+        sessions = [c.kwargs['session'] for c in mock_yf.Ticker.call_args_list]
+        assert sessions == [quotes._session, quotes._session]
+
     def test_get_quotes_empty_list(self):
         """Test quote retrieval with empty symbol list."""
         quotes = YahooQuotes()
         result = quotes.get_quotes([])
-        assert result == {}
\ No newline at end of file
+        assert result == {}
+
+    def test_decode_cache_with_nan(self):
+        """Test that cache files containing NaN still decode."""
+        data = yahoo_quotes._decode_cache(b'{"quotes": {"X": {"current_price": NaN}}}')
+        assert math.isnan(data['quotes']['X']['current_price'])
+
+    def test_is_cache_valid_allow_stale(self):
+        """Test that expired entries are usable within the stale window."""
+        quotes = YahooQuotes(load_from_file=False)
+        quotes.api_config = {'cache_duration': 300, 'stale_duration': 3600}
+        quotes.cache_timestamps['STALE'] = time.time() - 600
+        try:
+            assert not quotes._is_cache_valid('STALE')
+            assert quotes._is_cache_valid('STALE', allow_stale=True)
+        finally:
+            quotes.clear_cache()
+
+    def test_is_cache_valid_stale_disabled(self):
+        """Test that expired entries are not used without a stale window."""
+        quotes = YahooQuotes(load_from_file=False)
+        quotes.api_config = {'cache_duration': 300}
+        quotes.cache_timestamps['STALE'] = time.time() - 600
+        try:
+            assert not quotes._is_cache_valid('STALE', allow_stale=True)
+        finally:
+            quotes.clear_cache()
+
+    def test_is_cache_valid_market_closed(self):
+        """Test that quotes taken outside trading hours are cached longer."""
+        quotes = YahooQuotes(load_from_file=False)
+        quotes.api_config = {'cache_duration': 300, 'closed_cache_duration': 600}
+        quotes.cache['OPEN'] = {'symbol': 'OPEN', 'market_state': 'REGULAR'}
+        quotes.cache['CLOSED'] = {'symbol': 'CLOSED', 'market_state': 'CLOSED'}
+        quotes.cache_timestamps['OPEN'] = time.time() - 450
+        quotes.cache_timestamps['CLOSED'] = time.time() - 450
+        try:
+            assert not quotes._is_cache_valid('OPEN')
+            assert quotes._is_cache_valid('CLOSED')
+        finally:
+            quotes.clear_cache()
+
+    def test_refresh_in_background(self):
+        """Test that a background refresh fetches the requested symbols."""
+        quotes = YahooQuotes(load_from_file=False)
+        with patch.object(YahooQuotes, '_get_quote_data') as mock_get_quote_data:
+            thread = quotes.refresh_in_background(['AAPL', 'MSFT', 'AAPL'])
+            thread.join(timeout=5)
+
+        assert thread.daemon
+        fetched = [c.args[0] for c in mock_get_quote_data.call_args_list]
+        assert fetched == ['AAPL', 'MSFT']
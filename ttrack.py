@@ -7,7 +7,8 @@ Includes comprehensive CRUD operations for portfolio management and tax analysis
 """
 
 from libs.config_loader import get_config_loader
-from libs.portfolio_library import PortfolioLibrary
+from libs.portfolio_library import PortfolioLibrary, VALID_SORT_COLUMNS
+from libs.portfolio_loader import PortfolioLoader
 from libs.tax_analysis import TaxAnalyzer
 from libs.lot_analysis import LotAnalyzer
 from conf.version import *
@@ -24,6 +25,9 @@ from termcolor import colored
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+# Pre-formatted help shown for a bare invocation, regenerated when its key changes
+HELP_CACHE_FILE = project_root / '.cache' / 'help.txt'
+
 
 class ColoredHelpFormatter(argparse.RawDescriptionHelpFormatter):
     """Custom help formatter that adds colors to group headings."""
@@ -179,6 +183,62 @@ class ColoredHelpFormatter(argparse.RawDescriptionHelpFormatter):
         return ansi_escape.sub('', text)
 
 
+def _date_arg(value: str) -> Optional[str]:
+    """Argument type for lot dates; "today" maps to None (current date)."""
+    return None if value.lower() == 'today' else value
+
+
+def _symbol_or_all(value: str) -> Optional[str]:
+    """Argument type for names that accept "all"; "all" maps to None."""
+    return None if value.lower() == 'all' else value.upper()
+
+
+class LazyVersionAction(argparse.Action):
+    """Print the version banner and exit, building the banner only when requested."""
+
+    def __init__(self, option_strings, dest=argparse.SUPPRESS, default=argparse.SUPPRESS,
+                 help="show program's version number and exit"):
+        super().__init__(option_strings=option_strings, dest=dest,
+                         default=default, nargs=0, help=help)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        print(banner(os.path.basename(parser.prog)))
+        parser.exit()
+
+
+class LazyDescriptionParser(argparse.ArgumentParser):
+    """Argument parser that builds its (banner-based) description only when help is formatted."""
+
+    def __init__(self, *args, description_fn=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.description_fn = description_fn
+
+    def format_help(self):
+        if self.description is None and self.description_fn is not None:
+            self.description = self.description_fn()
+        return super().format_help()
+
+
+class AddLotAction(argparse.Action):
+    """Validate --add-lot arguments and convert the numeric fields at parse time."""
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        if not 5 <= len(values) <= 6:
+            parser.error(
+                f"{option_string} requires 5 or 6 arguments: PORTFOLIO SYMBOL DATE SHARES COST_BASIS [MANUAL_PRICE]")
+
+        portfolio, symbol = values[:2]
+        date = _date_arg(values[2])
+        try:
+            # Shares, cost basis and the optional manual price
+            numbers = [float(value) for value in values[3:]]
+        except ValueError:
+            parser.error(
+                f"{option_string}: shares, cost basis and manual price must be numbers")
+
+        setattr(namespace, self.dest, [portfolio, symbol, date, *numbers])
+
+
 class PortfolioCRUD:
     """
     Comprehensive CRUD operations for portfolio management.
@@ -813,14 +873,27 @@ class PortfolioCRUD:
         except Exception as e:
             print(f"Error in tax analysis: {e}")
 
+    def _load_all_portfolios(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load every portfolio, including those in a bundle file.
+
+        Returns:
+            Dictionary mapping portfolio names to portfolio data
+        """
+        loader = PortfolioLoader()
+        loader.portfolios_dir = self.portfolios_dir
+        try:
+            return loader.load_portfolios()
+        except FileNotFoundError:
+            return {}
+
     def get_tax_analysis_all_portfolios(self) -> None:
         """
         Get tax analysis for all portfolios.
         """
         try:
-            # Get all portfolio files
-            portfolio_files = list(self.portfolios_dir.glob("*.yaml"))
-            if not portfolio_files:
+            portfolios = self._load_all_portfolios()
+            if not portfolios:
                 print("No portfolios found")
                 return
 
@@ -836,15 +909,10 @@ class PortfolioCRUD:
             portfolio_data = {}
 
             # First pass: collect all symbols and portfolio data
-            for portfolio_file in sorted(portfolio_files):
-                portfolio_name = portfolio_file.stem.upper()
-
-                with open(portfolio_file, 'r') as f:
-                    data = yaml.safe_load(f)
-
+            for portfolio_name, data in portfolios.items():
                 stocks = data.get('stocks', {})
                 if stocks:
-                    portfolio_data[portfolio_name] = stocks
+                    portfolio_data[portfolio_name.upper()] = stocks
                     all_symbols.update(stocks.keys())
 
             if not all_symbols:
@@ -932,21 +1000,15 @@ class PortfolioCRUD:
         Shows long-term holdings (1+ years old) with potential gains.
         """
         try:
-            # Get all portfolio files
-            portfolio_files = list(self.portfolios_dir.glob("*.yaml"))
-            if not portfolio_files:
+            portfolios = self._load_all_portfolios()
+            if not portfolios:
                 print("No portfolios found")
                 return
 
             all_long_term_lots = []
 
             # Process each portfolio
-            for portfolio_file in portfolio_files:
-                portfolio_name = portfolio_file.stem
-
-                with open(portfolio_file, 'r') as f:
-                    portfolio_data = yaml.safe_load(f)
-
+            for portfolio_name, portfolio_data in portfolios.items():
                 stocks = portfolio_data.get('stocks', {})
                 if not stocks:
                     continue
@@ -1110,19 +1172,63 @@ def _display_all_portfolios(pl, args, config_loader):
         pl.display_all_portfolios()
 
 
+def _help_cache_key(config_loader) -> str:
+    """
+    Build the key identifying the help text for this script and environment.
+
+    Args:
+        config_loader: Configuration loader (help shows the default terminal width)
+
+    Returns:
+        Key string stored on the first line of the help cache file
+    """
+    return '|'.join(str(part) for part in (
+        VERSION, RELEASE_DATE, __file__, os.path.getmtime(__file__),
+        config_loader.get_terminal_width(), sys.stdout.isatty(),
+        os.environ.get('NO_COLOR'), os.environ.get('FORCE_COLOR')))
+
+
+def _read_cached_help(key: str) -> Optional[str]:
+    """Return the cached help text if it was generated for key, else None."""
+    try:
+        with open(HELP_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cached_key, _, help_text = f.read().partition('\n')
+    except OSError:
+        return None
+    return help_text if cached_key == key else None
+
+
+def _write_cached_help(key: str, help_text: str) -> None:
+    """Store the formatted help text for later bare invocations."""
+    try:
+        HELP_CACHE_FILE.parent.mkdir(exist_ok=True)
+        with open(HELP_CACHE_FILE, 'w', encoding='utf-8') as f:
+            f.write(f"{key}\n{help_text}")
+    except OSError:
+        pass  # The cache is only an optimization
+
+
 def main():
     """Main entry point for the TradeTrack application."""
     # Get configuration
     config_loader = get_config_loader()
     app_config = config_loader.get_config()
 
+    # Bare invocation: print the cached help without building the parser
+    if len(sys.argv) == 1:
+        help_key = _help_cache_key(config_loader)
+        help_text = _read_cached_help(help_key)
+        if help_text is not None:
+            sys.stdout.write(help_text)
+            return
+
     # Main argument parser
     tool = os.path.basename(__file__)
-    parser = argparse.ArgumentParser(
+    parser = LazyDescriptionParser(
         add_help=False,
         prog=__file__,
         formatter_class=ColoredHelpFormatter,
-        description=f"""{banner(tool)} - Stock / Crypto Portfolio Tracking Tool.
+        description_fn=lambda: f"""{banner(tool)} - Stock / Crypto Portfolio Tracking Tool.
 by {AUTHOR}
 {GIT_REPO}
 
@@ -1191,8 +1297,7 @@ Modern portfolio tracker with YAML configuration, Yahoo Finance API, and Rich di
     # General options
     general.add_argument('-h', '--help', action='help',
                          help='Show this help message and exit.')
-    general.add_argument(
-        '--version', '-v', action='version', version=banner(tool))
+    general.add_argument('--version', '-v', action=LazyVersionAction)
     general.add_argument('--debug', action='store_true',
                          default=False, help='Enable DEBUG mode.')
 
@@ -1207,7 +1312,7 @@ Modern portfolio tracker with YAML configuration, Yahoo Finance API, and Rich di
 
     # Portfolio display options
     portfolio.add_argument('-p', dest='portfolio', help='Display specific portfolio',
-                           action='append', nargs='+', type=lambda s: s.upper())
+                           action='append', nargs='+', type=str.upper)
     portfolio.add_argument('--all', action='store_true',
                            default=False, help='Display all portfolios combined.')
     portfolio.add_argument('--grouped', action='store_true',
@@ -1232,7 +1337,7 @@ Modern portfolio tracker with YAML configuration, Yahoo Finance API, and Rich di
                            help='Sort by multiple columns (e.g., --sort-multi portfolio symbol)')
 
     # Lot management options
-    lots.add_argument('--add-lot', nargs='+', metavar='ARG',
+    lots.add_argument('--add-lot', nargs='+', metavar='ARG', action=AddLotAction,
                       help='Add a new lot to a portfolio. Use "today" for current date. Manual price is optional. Args: PORTFOLIO SYMBOL DATE SHARES COST_BASIS [MANUAL_PRICE]')
     lots.add_argument('--remove-lot', nargs=3, metavar=('PORTFOLIO', 'SYMBOL', 'LOT_INDEX'),
                       help='Remove a lot from a portfolio by index.')
@@ -1258,7 +1363,7 @@ Modern portfolio tracker with YAML configuration, Yahoo Finance API, and Rich di
                             help='Restore a portfolio from backup.')
 
     # Analysis options
-    analysis.add_argument('--tax-analysis', nargs=2, metavar=('PORTFOLIO', 'SYMBOL'),
+    analysis.add_argument('--tax-analysis', nargs=2, metavar=('PORTFOLIO', 'SYMBOL'), type=_symbol_or_all,
                           help='Show tax analysis for a portfolio or specific symbol.')
     analysis.add_argument('--tax-harvesting', action='store_true',
                           help='Show tax harvesting opportunities (long-term holdings 1+ years old).')
@@ -1269,19 +1374,35 @@ Modern portfolio tracker with YAML configuration, Yahoo Finance API, and Rich di
 
     # Parse arguments
     if len(sys.argv[1:]) == 0:
-        parser.print_help()
+        help_text = parser.format_help()
+        _write_cached_help(help_key, help_text)
+        sys.stdout.write(help_text)
         parser.exit()
     else:
         args = parser.parse_args()
 
+        # Reject unknown sort columns before any portfolio or quote loading
+        requested_sort_columns = set(args.sort_multi or [])
+        if args.sort_column:
+            requested_sort_columns.add(args.sort_column)
+        invalid_sort_columns = requested_sort_columns - VALID_SORT_COLUMNS
+        if invalid_sort_columns:
+            parser.error(
+                f"invalid sort column(s): {', '.join(sorted(invalid_sort_columns))}. "
+                f"Available: {', '.join(sorted(VALID_SORT_COLUMNS))}")
+
+        # Flatten the requested portfolio names (args.portfolio is a list of lists)
+        requested_portfolios = [
+            name for group in args.portfolio for name in group] if args.portfolio else []
+
         # Determine if we need to load portfolios for display operations
+        want_portfolio = args.portfolio is not None
+        want_all = args.all
+        want_csv = args.csv_file is not None
+        want_stats = args.stats
+        want_list = args.list
         needs_portfolio_loading = (
-            args.portfolio is not None or
-            args.all or
-            args.csv_file is not None or
-            args.stats or
-            args.list
-        )
+            want_portfolio or want_all or want_csv or want_stats or want_list)
 
         # Only initialize and load portfolios if needed for display operations
         if needs_portfolio_loading:
@@ -1304,15 +1425,10 @@ Modern portfolio tracker with YAML configuration, Yahoo Finance API, and Rich di
             )
 
             # Auto-include crypto for specific portfolio display if portfolio contains crypto
-            if args.portfolio and not args.all:
+            if requested_portfolios and not want_all:
                 pl.load_portfolio_names_only()
-                # Flatten the portfolio list (args.portfolio is a list of lists)
-                portfolio_names = [
-                    name for sublist in args.portfolio for name in sublist]
-                for portfolio_name in portfolio_names:
-                    if pl._portfolio_contains_crypto(portfolio_name):
-                        pl.include_crypto = True
-                        break
+                if any(pl._portfolio_contains_crypto(name) for name in requested_portfolios):
+                    pl.include_crypto = True
 
             # Load portfolios
             try:
@@ -1327,7 +1443,7 @@ Modern portfolio tracker with YAML configuration, Yahoo Finance API, and Rich di
         # Handle display operations (only if portfolios were loaded)
         if needs_portfolio_loading:
             # Handle list portfolios
-            if args.list:
+            if want_list:
                 portfolio_names = pl.get_portfolio_names()
                 print("Available portfolios:")
                 for name in sorted(portfolio_names):
@@ -1336,33 +1452,33 @@ Modern portfolio tracker with YAML configuration, Yahoo Finance API, and Rich di
                 return
 
             # Handle different actions
-            if args.portfolio is not None:
+            if want_portfolio:
                 # Validate portfolio names
-                available_portfolios = pl.get_portfolio_names()
-
-                for portfolio in args.portfolio:
-                    if portfolio[0] not in available_portfolios:
-                        print(f"ERROR: Portfolio '{portfolio[0]}' not found.")
-                        print("Available portfolios:")
-                        for name in sorted(available_portfolios):
-                            print(f"  - {name}")
-                        print("Use --list to see all available portfolios.")
-                        print("Use --all to display all portfolios combined.")
-                        sys.exit(1)
+                available_portfolios = set(pl.get_portfolio_names())
+                missing_portfolios = [
+                    name for name in requested_portfolios if name not in available_portfolios]
+                if missing_portfolios:
+                    print(f"ERROR: Portfolio '{missing_portfolios[0]}' not found.")
+                    print("Available portfolios:")
+                    for name in sorted(available_portfolios):
+                        print(f"  - {name}")
+                    print("Use --list to see all available portfolios.")
+                    print("Use --all to display all portfolios combined.")
+                    sys.exit(1)
 
                 # Display specific portfolios
-                for portfolio in args.portfolio:
-                    pl.display_portfolio(portfolio[0])
+                for portfolio_name in requested_portfolios:
+                    pl.display_portfolio(portfolio_name)
 
-            elif args.all:
+            elif want_all:
                 # Display all portfolios
                 _display_all_portfolios(pl, args, config_loader)
 
-            elif args.csv_file is not None:
+            elif want_csv:
                 # Export to CSV
                 pl.export_to_csv(args.csv_file[0])
 
-            elif args.stats:
+            elif want_stats:
                 # Display statistics
                 pl.display_statistics()
 
@@ -1371,34 +1487,10 @@ Modern portfolio tracker with YAML configuration, Yahoo Finance API, and Rich di
             # Initialize CRUD operations
             crud = PortfolioCRUD()
 
-            # Validate minimum required arguments
-            if len(args.add_lot) < 5:
-                print(
-                    "Error: --add-lot requires at least 5 arguments: PORTFOLIO SYMBOL DATE SHARES COST_BASIS [MANUAL_PRICE]")
-                sys.exit(1)
-
+            # Argument count, numeric fields and "today" are handled by AddLotAction
             portfolio, symbol, date, shares, cost_basis = args.add_lot[:5]
             manual_price = args.add_lot[5] if len(args.add_lot) > 5 else None
 
-            # Handle special values
-            if date.lower() == 'today':
-                date = None  # Will use current date
-
-            # Handle manual price
-            if manual_price is not None:
-                try:
-                    manual_price = float(manual_price)
-                except ValueError:
-                    print("Error: Manual price must be a number")
-                    sys.exit(1)
-
-            try:
-                shares = float(shares)
-                cost_basis = float(cost_basis)
-            except ValueError:
-                print("Error: Shares and cost basis must be numbers")
-                sys.exit(1)
-
             success = crud.add_lot(
                 portfolio, symbol, shares, cost_basis, date, manual_price)
             sys.exit(0 if success else 1)
@@ -1480,12 +1572,10 @@ Modern portfolio tracker with YAML configuration, Yahoo Finance API, and Rich di
 
             portfolio, symbol = args.tax_analysis
 
-            # Check if user wants tax analysis for all portfolios
-            if portfolio.lower() == 'all':
+            # "all" is parsed to None for either argument
+            if portfolio is None:
                 crud.get_tax_analysis_all_portfolios()
             else:
-                if symbol.lower() == 'all':
-                    symbol = None
                 crud.get_tax_analysis(portfolio, symbol)
             sys.exit(0)
 